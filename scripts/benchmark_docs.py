@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from build_accessibility_workflow_report import (
+    CONTENT_WIDTH,
+    REPO_ROOT,
+    Inventory,
+    InventoryRow,
+    LayoutDocument,
+    PDFWriter,
+    appendix_b_rows,
+    build_report,
+    context_label,
+    current_inventory_rows,
+    enrich_master_rows,
+    load_beta_terms,
+    load_inventory,
+    measure_text,
+    pdf_num,
+    rgb,
+    text_width_units,
+    wrap_text,
+    write_csv,
+)
+from build_session_view_ui_reference_pdf import build_pdf
+
+
+BENCHMARK_VERSION = 1
+DEFAULT_SIZES = [200, 1_000, 10_000, 100_000]
+DEFAULT_BASELINE = REPO_ROOT / "tmp" / "benchmarks" / "baseline.json"
+DEFAULT_TOLERANCE = 0.25
+NOISE_FLOOR_SECONDS = 0.01
+BENCHMARK_DATE = "2000-01-01"
+APPENDIX_WIDTHS = [98.0, 38.0, 38.0, 78.0, 110.0, CONTENT_WIDTH - 98.0 - 38.0 - 38.0 - 78.0 - 110.0]
+SPEED_KEYS = ("rows_per_s", "pages_per_s", "mb_per_s", "calls_per_s")
+
+
+def synthetic_inventory(base_rows: list[InventoryRow], size: int) -> list[InventoryRow]:
+    rows: list[InventoryRow] = []
+    for index in range(size):
+        row = base_rows[index % len(base_rows)]
+        copy = index // len(base_rows)
+        path = row.canonical_path.replace(" N", f" {copy % 128}").replace(" M", f" {copy // 128}")
+        rows.append(row._replace(canonical_path=path))
+    return rows
+
+
+def reset_caches() -> None:
+    for cached in (text_width_units, pdf_num, rgb, context_label):
+        cached.cache_clear()
+
+
+def timed(run: Callable[[], object]) -> tuple[float, object]:
+    reset_caches()
+    start = time.perf_counter()
+    result = run()
+    return time.perf_counter() - start, result
+
+
+def throughput(seconds: float, *, rows: int = 0, pages: int = 0, size_bytes: int = 0, calls: int = 0) -> dict:
+    seconds = max(seconds, 1e-9)
+    metrics: dict[str, float] = {"seconds": round(seconds, 6)}
+    if rows:
+        metrics["rows_per_s"] = round(rows / seconds, 1)
+    if pages:
+        metrics["pages_per_s"] = round(pages / seconds, 2)
+    if size_bytes:
+        metrics["mb_per_s"] = round(size_bytes / seconds / 1_000_000, 3)
+    if calls:
+        metrics["calls_per_s"] = round(calls / seconds, 1)
+    return metrics
+
+
+def benchmark_size(base_rows: list[InventoryRow], size: int, work_dir: Path, *, end_to_end: bool) -> dict[str, dict]:
+    rows = synthetic_inventory(base_rows, size)
+    master_csv = work_dir / f"inventory-{size}.csv"
+    write_csv(master_csv, rows, ["layer", "object", "canonical_path", "member_type", "member_name"])
+    csv_bytes = master_csv.stat().st_size
+    stages: dict[str, dict] = {}
+
+    seconds, loaded = timed(lambda: load_inventory(master_csv))
+    stages["load_inventory"] = throughput(seconds, rows=size, size_bytes=csv_bytes)
+
+    seconds, enriched = timed(lambda: enrich_master_rows(loaded))
+    stages["enrich_master_rows"] = throughput(seconds, rows=size)
+    inventory = Inventory(enriched)
+
+    labels = [row.accessible_label for row in inventory]
+    seconds, _ = timed(lambda: [measure_text(label, 7.1, "F3") for label in labels])
+    stages["measure_text"] = throughput(seconds, calls=size)
+
+    contexts = [row.context_label for row in inventory]
+    seconds, _ = timed(lambda: [wrap_text(text, 60.0, 7.1, font="F3") for text in contexts])
+    stages["wrap_text"] = throughput(seconds, calls=size)
+
+    table_rows = appendix_b_rows(inventory)
+    document = LayoutDocument("Benchmark", "Synthetic inventory")
+    seconds, _ = timed(
+        lambda: document.table(
+            ["Workflow", "Tier", "Lane", "Source token", "Spoken label", "Context"],
+            table_rows,
+            APPENDIX_WIDTHS,
+            body_font="F3",
+            body_size=7.1,
+            body_leading=9.0,
+            header_size=8.0,
+        )
+    )
+    pages = len(document.pages)
+    stages["layout_table"] = throughput(seconds, rows=size, pages=pages)
+
+    document.add_header_footer()
+    output_pdf = work_dir / f"table-{size}.pdf"
+    seconds, _ = timed(lambda: PDFWriter(document.pages, forms=document.forms).write(output_pdf))
+    stages["pdf_write"] = throughput(seconds, pages=pages, size_bytes=output_pdf.stat().st_size)
+
+    if end_to_end:
+        current_rows = current_inventory_rows(load_beta_terms(REPO_ROOT / "SESSION_UI_TERMS_INVENTORY.csv"))
+        report_pdf = work_dir / f"report-{size}.pdf"
+        seconds, page_count = timed(
+            lambda: build_report(
+                inventory,
+                current_rows,
+                report_pdf,
+                work_dir / f"report-{size}-pages",
+                generated_on=BENCHMARK_DATE,
+            )
+        )
+        stages["build_report"] = throughput(seconds, rows=size, pages=page_count, size_bytes=report_pdf.stat().st_size)
+
+        reference_pdf = work_dir / f"reference-{size}.pdf"
+        seconds, page_count = timed(lambda: build_pdf(master_csv, reference_pdf, generated_on=BENCHMARK_DATE))
+        stages["build_pdf"] = throughput(seconds, rows=size, pages=page_count, size_bytes=reference_pdf.stat().st_size)
+    return stages
+
+
+def run_benchmarks(sizes: list[int], *, repeat: int, end_to_end: bool) -> dict:
+    base_rows = load_inventory(REPO_ROOT / "SESSION_VIEW_READABLE_UI_MASTER_LIST.csv")
+    results: dict[str, dict[str, dict]] = {}
+    with tempfile.TemporaryDirectory(prefix="docs-benchmark-") as work_dir:
+        for size in sizes:
+            best: dict[str, dict] = {}
+            for _ in range(repeat):
+                for stage, metrics in benchmark_size(base_rows, size, Path(work_dir), end_to_end=end_to_end).items():
+                    if stage not in best or metrics["seconds"] < best[stage]["seconds"]:
+                        best[stage] = metrics
+            results[str(size)] = best
+            print_size(size, best)
+    return {
+        "version": BENCHMARK_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def print_size(size: int, stages: dict[str, dict]) -> None:
+    print(f"{size} rows")
+    for stage, metrics in stages.items():
+        speeds = ", ".join(f"{key} {metrics[key]}" for key in SPEED_KEYS if key in metrics)
+        print(f"  {stage:<20} {metrics['seconds']:>10.4f}s  {speeds}")
+
+
+def regressions(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    if baseline.get("version") != BENCHMARK_VERSION:
+        raise ValueError(f"baseline version {baseline.get('version')} does not match {BENCHMARK_VERSION}")
+    found = []
+    for size, stages in current["results"].items():
+        for stage, metrics in stages.items():
+            recorded = baseline["results"].get(size, {}).get(stage)
+            if recorded is None:
+                continue
+            limit = recorded["seconds"] * (1 + tolerance) + NOISE_FLOOR_SECONDS
+            if metrics["seconds"] > limit:
+                found.append(
+                    f"{stage} at {size} rows: {metrics['seconds']:.4f}s vs baseline {recorded['seconds']:.4f}s"
+                )
+    return found
+
+
+def sizes_arg(value: str) -> list[int]:
+    try:
+        sizes = [int(part) for part in value.split(",") if part]
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"expected comma-separated row counts, got {value!r}") from error
+    if not sizes or min(sizes) < 1:
+        raise argparse.ArgumentTypeError("row counts must be positive")
+    return sizes
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark enrichment, layout and PDF writing on synthetic data.")
+    parser.add_argument(
+        "--sizes",
+        type=sizes_arg,
+        default=DEFAULT_SIZES,
+        help=f"comma-separated inventory row counts (default: {','.join(map(str, DEFAULT_SIZES))})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="runs per size; the fastest run of each stage is kept (default: 1)",
+    )
+    parser.add_argument(
+        "--skip-end-to-end",
+        action="store_true",
+        help="time the individual stages only, without build_report and build_pdf",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=DEFAULT_BASELINE,
+        help=f"baseline JSON to compare against or write (default: {DEFAULT_BASELINE.relative_to(REPO_ROOT)})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="write these results as the new baseline instead of comparing against it",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"allowed slowdown per stage before it counts as a regression (default: {DEFAULT_TOLERANCE})",
+    )
+    parser.add_argument("--output", type=Path, help="also write these results as JSON to this path")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    results = run_benchmarks(args.sizes, repeat=max(args.repeat, 1), end_to_end=not args.skip_end_to_end)
+    serialized = json.dumps(results, indent=2, sort_keys=True) + "\n"
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(serialized, encoding="utf-8")
+
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(serialized, encoding="utf-8")
+        print(f"[OK] baseline written: {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"[OK] no baseline at {args.baseline}; rerun with --save-baseline to record one")
+        return
+
+    found = regressions(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+    for regression in found:
+        print(f"[FAIL] {regression}")
+    if found:
+        sys.exit(1)
+    print(f"[OK] no stage slower than baseline by more than {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
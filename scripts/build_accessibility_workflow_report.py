@@ -1,12 +1,30 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import cProfile
 import csv
+import hashlib
+import heapq
+import json
+import multiprocessing
+import os
+import pickle
+import re
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from types import MappingProxyType
+from typing import BinaryIO, Callable, Iterable, Iterator, Mapping, NamedTuple
 
 
 PAGE_WIDTH = 612.0
@@ -28,6 +46,86 @@ SOFT_FILL = (0.96, 0.93, 0.88)
 RULE = (0.82, 0.78, 0.73)
 WHITE = (1.0, 1.0, 1.0)
 
+DEFAULT_COMPRESS_LEVEL = 6
+BUILD_MANIFEST_VERSION = 1
+SECTION_CACHE_VERSION = 3
+BUILD_PROFILE_VERSION = 2
+REPORT_SOURCE = Path(__file__).resolve()
+REPO_ROOT = REPORT_SOURCE.parents[1]
+RULES_PATH = REPORT_SOURCE.with_name("inventory_rules.json")
+DEFAULT_SORT_CHUNK_ROWS = 200_000
+ENRICHED_FIELDNAMES = [
+    "workflow_order",
+    "workflow_id",
+    "workflow_title",
+    "palette_lane",
+    "priority_tier",
+    "layer",
+    "object",
+    "canonical_path",
+    "member_type",
+    "member_name",
+    "accessible_label",
+    "context_label",
+    "blind_vi_purpose",
+]
+BETA_TERM_FIELDNAMES = ["workflow_group", "term", "kind", "current_surface", "notes"]
+OP_RAW = 0
+OP_FORM = 1
+OP_FILL_RECT = 2
+OP_STROKE_RECT = 3
+OP_STROKE_LINE = 4
+OP_TEXT = 5
+OP_TEXT_LINES = 6
+TEXT_OPS = (OP_TEXT, OP_TEXT_LINES)
+PDF_HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+PDF_OBJECT_STREAM_HEADER = b"%PDF-1.5\n%\xe2\xe3\xcf\xd3\n"
+OBJECT_STREAM_CAPACITY = 100
+FONT_OBJECTS = (
+    "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>",
+    "<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>",
+    "<< /Type /Font /Subtype /Type1 /BaseFont /Courier-Bold >>",
+)
+
+# Standard 14 AFM advance widths (1/1000 em) for codes 32-126 in StandardEncoding.
+HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 222, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    222, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 278, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    278, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+COURIER_WIDTH = 600
+FALLBACK_GLYPH_WIDTH = 556
+FONT_GLYPH_WIDTHS = {
+    "F1": (0,) * 32 + HELVETICA_WIDTHS + (FALLBACK_GLYPH_WIDTH,) * 129,
+    "F2": (0,) * 32 + HELVETICA_BOLD_WIDTHS + (FALLBACK_GLYPH_WIDTH,) * 129,
+    "F3": (0,) * 32 + (COURIER_WIDTH,) * 224,
+    "F4": (0,) * 32 + (COURIER_WIDTH,) * 224,
+}
+
+STARTXREF_PATTERN = re.compile(rb"startxref\s+(\d+)\s+%%EOF")
+XREF_SUBSECTION_PATTERN = re.compile(rb"(\d+) (\d+)\r?\n")
+OBJECT_HEADER_PATTERN = re.compile(rb"(\d+)\s+\d+\s+obj\s*")
+STREAM_START_PATTERN = re.compile(rb"\s*stream(?:\r\n|\r|\n)?")
+STREAM_END_PATTERN = re.compile(rb"(?:\r\n|\r|\n)?endstream")
+REFERENCE_PATTERN = re.compile(rb"(\d+) 0 R")
+PARENT_PATTERN = re.compile(rb"/Parent \d+ 0 R")
+KIDS_PATTERN = re.compile(rb"/Kids \[([^\]]*)\]")
+PAGE_TYPE_PATTERN = re.compile(rb"/Type /Page(?![a-zA-Z])")
+XREF_TYPE_PATTERN = re.compile(rb"/Type /XRef(?![a-zA-Z])")
+XREF_WIDTHS_PATTERN = re.compile(rb"/W \[(\d+) (\d+) (\d+)\]")
+
 
 @dataclass(frozen=True)
 class Workflow:
@@ -202,111 +300,915 @@ CURRENT_WORKFLOW_NAMES = {
 
 
 class PDFPage:
-    def __init__(self) -> None:
-        self.commands: list[str] = []
+    def __init__(self, *, recording: bool = True) -> None:
+        self.ops: list[tuple] = []
+        self.recording = recording
 
     def add(self, command: str) -> None:
-        self.commands.append(command)
+        if self.recording:
+            self.ops.append((OP_RAW, command))
+
+    def extend(self, ops: Iterable[tuple]) -> None:
+        if self.recording:
+            self.ops.extend(ops)
+
+    def form(self, name: str) -> None:
+        if self.recording:
+            self.ops.append((OP_FORM, name))
+
+    def fill_rect(self, color: tuple[float, float, float], x: float, y: float, width: float, height: float) -> None:
+        if self.recording:
+            self.ops.append((OP_FILL_RECT, color, x, y, width, height))
+
+    def stroke_rect(
+        self,
+        color: tuple[float, float, float],
+        line_width: float,
+        x: float,
+        y: float,
+        width: float,
+        height: float,
+    ) -> None:
+        if self.recording:
+            self.ops.append((OP_STROKE_RECT, color, line_width, x, y, width, height))
+
+    def stroke_line(
+        self,
+        color: tuple[float, float, float],
+        line_width: float,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+    ) -> None:
+        if self.recording:
+            self.ops.append((OP_STROKE_LINE, color, line_width, x1, y1, x2, y2))
+
+    def content(self) -> bytes:
+        parts = render_ops(self.ops)
+        return ("\n".join(parts) + ("\n" if parts else "")).encode("utf-8")
+
+
+class PDFStreamWriter:
+    def __init__(
+        self,
+        handle: BinaryIO,
+        *,
+        object_streams: bool = False,
+        compress_level: int = DEFAULT_COMPRESS_LEVEL,
+    ) -> None:
+        self.handle = handle
+        self.offsets: list[int | None] = []
+        self.packed: dict[int, tuple[int, int]] = {}
+        self.pending: list[tuple[int, bytes]] = []
+        self.pending_stream_id = 0
+        self.object_streams = object_streams
+        self.compress_level = compress_level
+        self.position = 0
+        self._emit(PDF_OBJECT_STREAM_HEADER if object_streams else PDF_HEADER)
+
+    def _emit(self, data: bytes) -> None:
+        self.handle.write(data)
+        self.position += len(data)
+
+    def reserve(self) -> int:
+        self.offsets.append(None)
+        return len(self.offsets)
+
+    def write_object(self, object_id: int, body: str | bytes) -> None:
+        if self.offsets[object_id - 1] is not None or object_id in self.packed:
+            raise RuntimeError(f"PDF object {object_id} was already written")
+        self.offsets[object_id - 1] = self.position
+        self._emit(f"{object_id} 0 obj\n".encode("utf-8"))
+        self._emit(body.encode("utf-8") if isinstance(body, str) else body)
+        self._emit(b"\nendobj\n")
+
+    def add_object(self, body: str | bytes) -> int:
+        object_id = self.reserve()
+        self.write_object(object_id, body)
+        return object_id
+
+    def pack_object(self, object_id: int, body: str | bytes) -> None:
+        if not self.object_streams:
+            self.write_object(object_id, body)
+            return
+        if self.offsets[object_id - 1] is not None or object_id in self.packed:
+            raise RuntimeError(f"PDF object {object_id} was already written")
+        if not self.pending:
+            self.pending_stream_id = self.reserve()
+        self.packed[object_id] = (self.pending_stream_id, len(self.pending))
+        self.pending.append((object_id, body.encode("utf-8") if isinstance(body, str) else body))
+        if len(self.pending) >= OBJECT_STREAM_CAPACITY:
+            self._flush_packed()
+
+    def add_packed(self, body: str | bytes) -> int:
+        object_id = self.reserve()
+        self.pack_object(object_id, body)
+        return object_id
+
+    def _flush_packed(self) -> None:
+        if not self.pending:
+            return
+        pairs: list[str] = []
+        offset = 0
+        for object_id, body in self.pending:
+            pairs.append(f"{object_id} {offset}")
+            offset += len(body) + 1
+        header = (" ".join(pairs) + "\n").encode("utf-8")
+        data = header + b"\n".join(body for _, body in self.pending)
+        self.write_object(
+            self.pending_stream_id,
+            stream_object(data, f"/Type /ObjStm /N {len(self.pending)} /First {len(header)}", self.compress_level),
+        )
+        self.pending = []
+
+    def finish(self, root_id: int) -> None:
+        if self.object_streams:
+            self._finish_xref_stream(root_id)
+            return
+        xref_offset = self.position
+        lines = [f"xref\n0 {len(self.offsets) + 1}\n", "0000000000 65535 f \n"]
+        for object_id, offset in enumerate(self.offsets, start=1):
+            if offset is None:
+                raise RuntimeError(f"PDF object {object_id} was not written")
+            lines.append(f"{offset:010d} 00000 n \n")
+        lines.append(
+            f"trailer << /Size {len(self.offsets) + 1} /Root {root_id} 0 R >>\n"
+            f"startxref\n{xref_offset}\n%%EOF\n"
+        )
+        self._emit("".join(lines).encode("utf-8"))
+
+    def _finish_xref_stream(self, root_id: int) -> None:
+        self._flush_packed()
+        xref_id = self.reserve()
+        xref_offset = self.position
+        size = len(self.offsets) + 1
+        width = max(1, (max(xref_offset, size).bit_length() + 7) // 8)
+        rows = [(0, 0, 65535)]
+        for object_id in range(1, size):
+            if object_id in self.packed:
+                rows.append((2, *self.packed[object_id]))
+            elif object_id == xref_id:
+                rows.append((1, xref_offset, 0))
+            elif self.offsets[object_id - 1] is None:
+                raise RuntimeError(f"PDF object {object_id} was not written")
+            else:
+                rows.append((1, self.offsets[object_id - 1], 0))
+        data = b"".join(
+            kind.to_bytes(1, "big") + field.to_bytes(width, "big") + extra.to_bytes(2, "big")
+            for kind, field, extra in rows
+        )
+        self.write_object(
+            xref_id,
+            stream_object(data, f"/Type /XRef /Size {size} /W [1 {width} 2] /Root {root_id} 0 R", self.compress_level),
+        )
+        self._emit(f"startxref\n{xref_offset}\n%%EOF\n".encode("utf-8"))
+
 
-    def extend(self, commands: Iterable[str]) -> None:
-        self.commands.extend(commands)
+def stream_object(data: bytes, entries: str, compress_level: int) -> bytes:
+    keys = [entries] if entries else []
+    if compress_level:
+        data = zlib.compress(data, compress_level)
+        keys.append("/Filter /FlateDecode")
+    keys.append(f"/Length {len(data)}")
+    header = f"<< {' '.join(keys)} >>\nstream\n".encode("utf-8")
+    return header + data + b"\nendstream"
 
-    def content(self) -> str:
-        return "\n".join(self.commands) + ("\n" if self.commands else "")
+
+class HintStreamBits:
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.value = 0
+        self.bits = 0
+
+    def write(self, value: int, bits: int) -> None:
+        if value < 0 or value >> bits:
+            raise ValueError(f"hint value {value} does not fit in {bits} bits")
+        self.value = (self.value << bits) | value
+        self.bits += bits
+        while self.bits >= 8:
+            self.bits -= 8
+            self.data.append((self.value >> self.bits) & 0xFF)
+        self.value &= (1 << self.bits) - 1
+
+    def write_all(self, values: Iterable[int], bits: int) -> None:
+        for value in values:
+            self.write(value, bits)
+        self.align()
+
+    def align(self) -> None:
+        if self.bits:
+            self.write(0, 8 - self.bits)
+
+
+def pdf_object(object_id: int, body: str | bytes) -> bytes:
+    data = body.encode("utf-8") if isinstance(body, str) else body
+    return f"{object_id} 0 obj\n".encode("utf-8") + data + b"\nendobj\n"
+
+
+def page_offset_hints(
+    page_objects: list[list[int]],
+    offsets: Mapping[int, int],
+    lengths: Mapping[int, int],
+    shared: list[list[int]],
+) -> bytes:
+    nobjects = [len(objects) for objects in page_objects]
+    page_lengths = [sum(lengths[object_id] for object_id in objects) for objects in page_objects]
+    content_offsets = [offsets[objects[1]] - offsets[objects[0]] for objects in page_objects]
+    content_lengths = [lengths[objects[1]] for objects in page_objects]
+    shared_counts = [len(identifiers) for identifiers in shared]
+    identifier_bits = max((max(identifiers, default=0) for identifiers in shared), default=0).bit_length()
+
+    hints = HintStreamBits()
+    columns = (nobjects, page_lengths, content_offsets, content_lengths)
+    least = [min(column) for column in columns]
+    delta_bits = [(max(column) - low).bit_length() for column, low in zip(columns, least)]
+    hints.write(least[0], 32)
+    hints.write(offsets[page_objects[0][0]], 32)
+    hints.write(delta_bits[0], 16)
+    hints.write(least[1], 32)
+    hints.write(delta_bits[1], 16)
+    hints.write(least[2], 32)
+    hints.write(delta_bits[2], 16)
+    hints.write(least[3], 32)
+    hints.write(delta_bits[3], 16)
+    hints.write(max(shared_counts).bit_length(), 16)
+    hints.write(identifier_bits, 16)
+    hints.write(0, 16)
+    hints.write(1, 16)
+    hints.write_all((value - least[0] for value in nobjects), delta_bits[0])
+    hints.write_all((value - least[1] for value in page_lengths), delta_bits[1])
+    hints.write_all(shared_counts, max(shared_counts).bit_length())
+    hints.write_all((identifier for identifiers in shared for identifier in identifiers), identifier_bits)
+    hints.write_all((value - least[2] for value in content_offsets), delta_bits[2])
+    hints.write_all((value - least[3] for value in content_lengths), delta_bits[3])
+    return bytes(hints.data)
+
+
+def shared_object_hints(group_lengths: list[int]) -> bytes:
+    least = min(group_lengths)
+    delta_bits = (max(group_lengths) - least).bit_length()
+    hints = HintStreamBits()
+    hints.write(0, 32)
+    hints.write(0, 32)
+    hints.write(len(group_lengths), 32)
+    hints.write(len(group_lengths), 32)
+    hints.write(0, 16)
+    hints.write(least, 32)
+    hints.write(delta_bits, 16)
+    hints.write_all((length - least for length in group_lengths), delta_bits)
+    hints.write_all((0 for _ in group_lengths), 1)
+    return bytes(hints.data)
 
 
 class PDFWriter:
-    def __init__(self, pages: list[PDFPage]) -> None:
+    def __init__(
+        self,
+        pages: Iterable[PDFPage],
+        *,
+        forms: dict[str, PDFPage] | None = None,
+        compress_level: int = DEFAULT_COMPRESS_LEVEL,
+        object_streams: bool = False,
+        linearize: bool = False,
+    ) -> None:
+        if not 0 <= compress_level <= 9:
+            raise ValueError("compress_level must be between 0 and 9")
+        if linearize and object_streams:
+            raise ValueError("linearized output cannot use object streams")
         self.pages = pages
+        self.forms = forms or {}
+        self.compress_level = compress_level
+        self.object_streams = object_streams
+        self.linearize = linearize
+
+    def _stream_object(self, data: bytes, entries: str = "") -> bytes:
+        return stream_object(data, entries, self.compress_level)
+
+    def _content_object(self, page: PDFPage) -> bytes:
+        content = self._stream_object(page.content())
+        if ACTIVE_PROFILE is not None:
+            ACTIVE_PROFILE.page_streams.append(len(content))
+        return content
+
+    def _form_object(self, form: PDFPage, fonts_id: int) -> bytes:
+        return self._stream_object(
+            form.content(),
+            "/Type /XObject /Subtype /Form "
+            f"/BBox [0 0 {pdf_num(PAGE_WIDTH)} {pdf_num(PAGE_HEIGHT)}] "
+            f"/Resources << /Font {fonts_id} 0 R >>",
+        )
 
-    def _stream_object(self, payload: str) -> bytes:
-        data = payload.encode("utf-8")
-        header = f"<< /Length {len(data)} >>\nstream\n".encode("utf-8")
-        return header + data + b"endstream"
+    @staticmethod
+    def _fonts_dict(font_ids: list[int]) -> str:
+        return (
+            "<< "
+            + " ".join(f"/F{number} {font_id} 0 R" for number, font_id in enumerate(font_ids, start=1))
+            + " >>"
+        )
+
+    @staticmethod
+    def _resources_dict(fonts_id: int, form_ids: dict[str, int]) -> str:
+        xobjects = " ".join(f"/{name} {form_id} 0 R" for name, form_id in form_ids.items())
+        if xobjects:
+            return f"<< /Font {fonts_id} 0 R /XObject << {xobjects} >> >>"
+        return f"<< /Font {fonts_id} 0 R >>"
+
+    @staticmethod
+    def _page_dict(pages_id: int, resources_id: int, content_id: int) -> str:
+        return (
+            f"<< /Type /Page /Parent {pages_id} 0 R "
+            f"/MediaBox [0 0 {pdf_num(PAGE_WIDTH)} {pdf_num(PAGE_HEIGHT)}] "
+            f"/Resources {resources_id} 0 R "
+            f"/Contents {content_id} 0 R >>"
+        )
+
+    @staticmethod
+    def _pages_dict(page_ids: list[int]) -> str:
+        kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+        return f"<< /Type /Pages /Count {len(page_ids)} /Kids [{kids}] >>"
 
     def write(self, path: Path) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        objects: list[bytes | None] = []
-
-        def reserve() -> int:
-            objects.append(None)
-            return len(objects)
-
-        def set_object(object_id: int, value: str | bytes) -> None:
-            objects[object_id - 1] = value.encode("utf-8") if isinstance(value, str) else value
-
-        font_regular = reserve()
-        font_bold = reserve()
-        font_mono = reserve()
-        font_mono_bold = reserve()
-        pages_id = reserve()
-        page_ids = [reserve() for _ in self.pages]
-        content_ids = [reserve() for _ in self.pages]
-        catalog_id = reserve()
-
-        set_object(font_regular, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
-        set_object(font_bold, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold >>")
-        set_object(font_mono, "<< /Type /Font /Subtype /Type1 /BaseFont /BaseFont /Courier >>".replace("/BaseFont /BaseFont", "/BaseFont"))
-        set_object(font_mono_bold, "<< /Type /Font /Subtype /Type1 /BaseFont /Courier-Bold >>")
-
-        for index, page in enumerate(self.pages):
-            payload = page.content()
-            set_object(content_ids[index], self._stream_object(payload))
-            page_body = (
-                f"<< /Type /Page /Parent {pages_id} 0 R "
-                f"/MediaBox [0 0 {pdf_num(PAGE_WIDTH)} {pdf_num(PAGE_HEIGHT)}] "
-                f"/Resources << /Font << "
-                f"/F1 {font_regular} 0 R /F2 {font_bold} 0 R "
-                f"/F3 {font_mono} 0 R /F4 {font_mono_bold} 0 R >> >> "
-                f"/Contents {content_ids[index]} 0 R >>"
+        with path.open("wb") as handle:
+            self.write_to(handle)
+
+    def write_to(self, handle: BinaryIO) -> None:
+        if self.linearize:
+            self._write_linearized(handle)
+            return
+        stream = PDFStreamWriter(handle, object_streams=self.object_streams, compress_level=self.compress_level)
+        font_ids = [stream.add_packed(body) for body in FONT_OBJECTS]
+        fonts_id = stream.add_packed(self._fonts_dict(font_ids))
+        form_ids = {name: stream.add_object(self._form_object(form, fonts_id)) for name, form in self.forms.items()}
+        resources_id = stream.add_packed(self._resources_dict(fonts_id, form_ids))
+        pages_id = stream.reserve()
+
+        page_ids: list[int] = []
+        for page in self.pages:
+            content_id = stream.add_object(self._content_object(page))
+            page_ids.append(stream.add_packed(self._page_dict(pages_id, resources_id, content_id)))
+
+        stream.pack_object(pages_id, self._pages_dict(page_ids))
+        catalog_id = stream.add_packed(f"<< /Type /Catalog /Pages {pages_id} 0 R >>")
+        stream.finish(catalog_id)
+
+    def _write_linearized(self, handle: BinaryIO) -> None:
+        pages = list(self.pages)
+        if not pages:
+            raise ValueError("a linearized PDF needs at least one page")
+
+        # Pages after the first and the page tree form the second half and take the low numbers.
+        page_ids = [0] + [2 * index - 1 for index in range(1, len(pages))]
+        content_ids = [0] + [2 * index for index in range(1, len(pages))]
+        pages_id = 2 * len(pages) - 1
+        first_half_ids = iter(range(pages_id + 1, pages_id + 8 + len(FONT_OBJECTS) + len(self.forms)))
+        linearization_id = next(first_half_ids)
+        catalog_id = next(first_half_ids)
+        page_ids[0] = next(first_half_ids)
+        content_ids[0] = next(first_half_ids)
+        resources_id = next(first_half_ids)
+        fonts_id = next(first_half_ids)
+        font_ids = [next(first_half_ids) for _ in FONT_OBJECTS]
+        form_ids = {name: next(first_half_ids) for name in self.forms}
+        hint_id = next(first_half_ids)
+        size = hint_id + 1
+
+        bodies: dict[int, bytes] = {catalog_id: pdf_object(catalog_id, f"<< /Type /Catalog /Pages {pages_id} 0 R >>")}
+        for page, page_id, content_id in zip(pages, page_ids, content_ids):
+            bodies[page_id] = pdf_object(page_id, self._page_dict(pages_id, resources_id, content_id))
+            bodies[content_id] = pdf_object(content_id, self._content_object(page))
+        bodies[resources_id] = pdf_object(resources_id, self._resources_dict(fonts_id, form_ids))
+        bodies[fonts_id] = pdf_object(fonts_id, self._fonts_dict(font_ids))
+        for font_id, body in zip(font_ids, FONT_OBJECTS):
+            bodies[font_id] = pdf_object(font_id, body)
+        for name, form_id in form_ids.items():
+            bodies[form_id] = pdf_object(form_id, self._form_object(self.forms[name], fonts_id))
+        bodies[pages_id] = pdf_object(pages_id, self._pages_dict(page_ids))
+
+        shared_ids = [resources_id, fonts_id, *font_ids, *form_ids.values()]
+        page_objects = [[page_ids[0], content_ids[0], *shared_ids]]
+        page_objects += [[page_id, content_id] for page_id, content_id in zip(page_ids[1:], content_ids[1:])]
+        order = [object_id for objects in page_objects for object_id in objects] + [pages_id]
+
+        def linearization_dict(length: int, hint_offset: int, hint_length: int, end: int, main_xref: int) -> str:
+            return (
+                f"<< /Linearized 1 /L {length} /H [{hint_offset} {hint_length}] /O {page_ids[0]} "
+                f"/E {end} /N {len(pages)} /T {main_xref} >>"
             )
-            set_object(page_ids[index], page_body)
 
-        kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
-        set_object(
-            pages_id,
-            f"<< /Type /Pages /Count {len(page_ids)} /Kids [{kids}] >>",
+        def first_page_trailer(main_xref: int) -> str:
+            return f"trailer\n<< /Size {size} /Root {catalog_id} 0 R /Prev {main_xref} >>\n"
+
+        # Offsets are not known until the layout is fixed, so both are padded to their widest form.
+        widest = 10**10 - 1
+        linearization_width = len(linearization_dict(widest, widest, widest, widest, widest))
+        trailer_width = len(first_page_trailer(widest)) - 1
+        linearization_offset = len(PDF_HEADER)
+        first_xref_offset = linearization_offset + len(pdf_object(linearization_id, " " * linearization_width))
+        catalog_offset = (
+            first_xref_offset
+            + len(f"xref\n{linearization_id} {size - linearization_id}\n")
+            + 20 * (size - linearization_id)
+            + trailer_width
+            + len("\nstartxref\n0\n%%EOF\n")
+        )
+        hint_offset = catalog_offset + len(bodies[catalog_id])
+
+        # Hint tables record offsets as if the hint stream were absent.
+        offsets: dict[int, int] = {}
+        position = hint_offset
+        for object_id in order:
+            offsets[object_id] = position
+            position += len(bodies[object_id])
+        lengths = {object_id: len(bodies[object_id]) for object_id in order}
+        page_hints = page_offset_hints(
+            page_objects,
+            offsets,
+            lengths,
+            [[]] + [list(range(2, len(page_objects[0])))] * (len(pages) - 1),
+        )
+        shared_hints = shared_object_hints([lengths[object_id] for object_id in page_objects[0]])
+        hint = pdf_object(
+            hint_id,
+            stream_object(page_hints + shared_hints, f"/S {len(page_hints)}", self.compress_level),
         )
-        set_object(catalog_id, f"<< /Type /Catalog /Pages {pages_id} 0 R >>")
 
-        output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
-        offsets = [0]
-        for object_id, body in enumerate(objects, start=1):
-            if body is None:
-                raise RuntimeError(f"PDF object {object_id} was not written")
-            offsets.append(len(output))
-            output.extend(f"{object_id} 0 obj\n".encode("utf-8"))
-            output.extend(body)
-            output.extend(b"\nendobj\n")
-
-        xref_offset = len(output)
-        output.extend(f"xref\n0 {len(objects) + 1}\n".encode("utf-8"))
-        output.extend(b"0000000000 65535 f \n")
-        for offset in offsets[1:]:
-            output.extend(f"{offset:010d} 00000 n \n".encode("utf-8"))
-        output.extend(
-            (
-                f"trailer << /Size {len(objects) + 1} /Root {catalog_id} 0 R >>\n"
-                f"startxref\n{xref_offset}\n%%EOF\n"
-            ).encode("utf-8")
+        offsets = {object_id: offset + len(hint) for object_id, offset in offsets.items()}
+        offsets[linearization_id] = linearization_offset
+        offsets[catalog_id] = catalog_offset
+        offsets[hint_id] = hint_offset
+        first_page_end = offsets[page_objects[1][0]] if len(pages) > 1 else offsets[pages_id]
+        main_xref_offset = position + len(hint)
+        main_xref = (
+            f"xref\n0 {linearization_id}\n0000000000 65535 f \n"
+            + "".join(f"{offsets[object_id]:010d} 00000 n \n" for object_id in range(1, linearization_id))
+            + f"trailer\n<< /Size {linearization_id} >>\nstartxref\n{first_xref_offset}\n%%EOF\n"
+        ).encode("utf-8")
+        file_length = main_xref_offset + len(main_xref)
+
+        first_xref = (
+            f"xref\n{linearization_id} {size - linearization_id}\n"
+            + "".join(f"{offsets[object_id]:010d} 00000 n \n" for object_id in range(linearization_id, size))
+            + first_page_trailer(main_xref_offset)[:-1].ljust(trailer_width)
+            + "\nstartxref\n0\n%%EOF\n"
+        ).encode("utf-8")
+        handle.write(PDF_HEADER)
+        handle.write(
+            pdf_object(
+                linearization_id,
+                linearization_dict(
+                    file_length,
+                    hint_offset,
+                    len(hint),
+                    first_page_end,
+                    main_xref_offset + len(f"xref\n0 {linearization_id}"),
+                ).ljust(linearization_width),
+            )
         )
-        path.write_bytes(output)
+        handle.write(first_xref)
+        handle.write(bodies[catalog_id])
+        handle.write(hint)
+        for object_id in order:
+            handle.write(bodies[object_id])
+        handle.write(main_xref)
+
+
+class PDFPageSplitter:
+    def __init__(self, source: Path) -> None:
+        self.source = source
+        self.data = source.read_bytes()
+        self.offsets: dict[int, int] = {}
+        self.packed: dict[int, tuple[int, int]] = {}
+        self.object_streams = False
+        self._object_stream_bodies: dict[int, list[bytes]] = {}
+        self.root_id = self._read_xref()
+        pages_id = self._ref(self.object_parts(self.root_id)[0], b"Pages")
+        self.page_ids = self._collect_pages(pages_id)
+
+    def _read_xref(self) -> int:
+        match = STARTXREF_PATTERN.search(self.data, max(0, len(self.data) - 64))
+        if match is None:
+            raise ValueError("PDF has no startxref marker")
+        position = int(match.group(1))
+        if not self.data.startswith(b"xref", position):
+            return self._read_xref_stream(position)
+
+        # Linearized files start at the first-page section and chain to the main table through /Prev.
+        root_id: int | None = None
+        known: set[int] = set()
+        visited: set[int] = set()
+        while True:
+            if position in visited:
+                raise ValueError("PDF xref /Prev chain loops")
+            if not self.data.startswith(b"xref", position):
+                raise ValueError("PDF xref /Prev does not point at an xref table")
+            visited.add(position)
+            trailer = self._read_xref_section(position, known)
+            if root_id is None and b"/Root" in trailer:
+                root_id = self._ref(trailer, b"Root")
+            previous = re.search(rb"/Prev (\d+)", trailer)
+            if previous is None:
+                break
+            position = int(previous.group(1))
+        if root_id is None:
+            raise ValueError("PDF trailer has no /Root reference")
+        return root_id
+
+    def _read_xref_section(self, position: int, known: set[int]) -> bytes:
+        position = self.data.index(b"\n", position) + 1
+        while True:
+            header = XREF_SUBSECTION_PATTERN.match(self.data, position)
+            if header is None:
+                break
+            first, count = int(header.group(1)), int(header.group(2))
+            position = header.end()
+            for object_id in range(first, first + count):
+                entry = self.data[position : position + 20]
+                if object_id not in known:
+                    known.add(object_id)
+                    if entry[17:18] == b"n":
+                        self.offsets[object_id] = int(entry[:10])
+                position += 20
+        return self.data[position : self.data.index(b"startxref", position)]
+
+    def _read_xref_stream(self, position: int) -> int:
+        header = OBJECT_HEADER_PATTERN.match(self.data, position)
+        if header is None:
+            raise ValueError("PDF startxref points at neither an xref table nor an xref stream")
+        xref_id = int(header.group(1))
+        self.offsets[xref_id] = position
+        body, tail = self.object_parts(xref_id)
+        if not XREF_TYPE_PATTERN.search(body):
+            raise ValueError(f"PDF object {xref_id} is not an xref stream")
+        if b"/Prev" in body:
+            raise ValueError("incrementally updated PDFs cannot be split")
+        widths_match = XREF_WIDTHS_PATTERN.search(body)
+        size_match = re.search(rb"/Size (\d+)", body)
+        if widths_match is None or size_match is None:
+            raise ValueError("PDF xref stream has no /W or /Size entry")
+        widths = [int(width) for width in widths_match.groups()]
+        index_match = re.search(rb"/Index \[([\d\s]+)\]", body)
+        bounds = [0, int(size_match.group(1))]
+        if index_match is not None:
+            bounds = [int(value) for value in index_match.group(1).split()]
+
+        data = self._stream_data(body, tail)
+        position = 0
+        for first, count in zip(bounds[::2], bounds[1::2]):
+            for object_id in range(first, first + count):
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(data[position : position + width], "big"))
+                    position += width
+                kind = fields[0] if widths[0] else 1
+                if kind == 1:
+                    self.offsets[object_id] = fields[1]
+                elif kind == 2:
+                    self.packed[object_id] = (fields[1], fields[2])
+        self.object_streams = True
+        return self._ref(body, b"Root")
+
+    def _stream_data(self, body: bytes, tail: bytes) -> bytes:
+        data = tail[len(b"\nstream\n") : -len(b"\nendstream")]
+        if b"/DecodeParms" in body:
+            raise ValueError("PDF streams with predictors cannot be split")
+        if b"/FlateDecode" in body:
+            return zlib.decompress(data)
+        if b"/Filter" in body:
+            raise ValueError("only FlateDecode streams can be split")
+        return data
+
+    def _packed_body(self, object_id: int) -> bytes:
+        stream_id, index = self.packed[object_id]
+        bodies = self._object_stream_bodies.get(stream_id)
+        if bodies is None:
+            body, tail = self.object_parts(stream_id)
+            count_match = re.search(rb"/N (\d+)", body)
+            first_match = re.search(rb"/First (\d+)", body)
+            if count_match is None or first_match is None:
+                raise ValueError(f"PDF object stream {stream_id} has no /N or /First entry")
+            data = self._stream_data(body, tail)
+            first = int(first_match.group(1))
+            pairs = [int(value) for value in data[:first].split()][: 2 * int(count_match.group(1))]
+            starts = [first + offset for offset in pairs[1::2]]
+            ends = starts[1:] + [len(data)]
+            bodies = [data[start:end].strip() for start, end in zip(starts, ends)]
+            self._object_stream_bodies[stream_id] = bodies
+        return bodies[index]
+
+    def _ref(self, body: bytes, key: bytes) -> int:
+        match = re.search(rb"/" + key + rb" (\d+) 0 R", body)
+        if match is None:
+            raise ValueError(f"PDF dictionary has no /{key.decode()} reference")
+        return int(match.group(1))
+
+    def _collect_pages(self, node_id: int) -> list[int]:
+        body = self.object_parts(node_id)[0]
+        if PAGE_TYPE_PATTERN.search(body):
+            return [node_id]
+        kids = KIDS_PATTERN.search(body)
+        if kids is None:
+            raise ValueError(f"PDF object {node_id} is neither a page nor a page tree")
+        page_ids: list[int] = []
+        for kid in REFERENCE_PATTERN.finditer(kids.group(1)):
+            page_ids.extend(self._collect_pages(int(kid.group(1))))
+        return page_ids
+
+    def object_parts(self, object_id: int) -> tuple[bytes, bytes]:
+        if object_id in self.packed:
+            return self._packed_body(object_id), b""
+        header = OBJECT_HEADER_PATTERN.match(self.data, self.offsets[object_id])
+        if header is None or int(header.group(1)) != object_id:
+            raise ValueError(f"xref offset for PDF object {object_id} is wrong")
+        start = header.end()
+        if self.data.startswith(b"<<", start):
+            dict_end = pdf_dict_end(self.data, start)
+        else:
+            dict_end = self.data.index(b"\nendobj", start)
+        tail = b""
+        stream_start = STREAM_START_PATTERN.match(self.data, dict_end)
+        if stream_start is not None:
+            length = self._length(self.data[start:dict_end])
+            stream_end = stream_start.end() + length
+            if STREAM_END_PATTERN.match(self.data, stream_end) is None:
+                raise ValueError(f"PDF object {object_id} has a wrong stream /Length")
+            # Other writers vary the line ends around the data; the tail is normalised to this writer's layout.
+            tail = b"\nstream\n" + self.data[stream_start.end() : stream_end] + b"\nendstream"
+        return self.data[start:dict_end], tail
+
+    def _length(self, body: bytes) -> int:
+        match = re.search(rb"/Length (\d+)", body)
+        if match is None:
+            raise ValueError("PDF stream has no direct /Length")
+        return int(match.group(1))
+
+    def page_resources(self, page_id: int) -> list[int]:
+        ordered: list[int] = []
+        seen = {page_id}
+        pending = [page_id]
+        while pending:
+            body = PARENT_PATTERN.sub(b"", self.object_parts(pending.pop(0))[0])
+            for match in REFERENCE_PATTERN.finditer(body):
+                object_id = int(match.group(1))
+                if object_id not in seen:
+                    seen.add(object_id)
+                    ordered.append(object_id)
+                    pending.append(object_id)
+        return ordered
+
+    def page_content(self, index: int) -> bytes:
+        body, tail = self.object_parts(self._ref(self.object_parts(self.page_ids[index])[0], b"Contents"))
+        return self._stream_data(body, tail)
+
+    def write_page(self, index: int, path: Path) -> None:
+        page_id = self.page_ids[index]
+        page_body = self.object_parts(page_id)[0]
+        resources = self.page_resources(page_id)
+        with path.open("wb") as handle:
+            stream = PDFStreamWriter(handle, object_streams=self.object_streams)
+            mapping = {object_id: stream.reserve() for object_id in resources}
+            pages_id = stream.reserve()
+            mapping[self._ref(page_body, b"Parent")] = pages_id
+            mapping[page_id] = stream.reserve()
+            for object_id in [*resources, page_id]:
+                body, tail = self.object_parts(object_id)
+                if tail:
+                    stream.write_object(mapping[object_id], renumber_references(body, mapping) + tail)
+                else:
+                    stream.pack_object(mapping[object_id], renumber_references(body, mapping))
+            stream.pack_object(pages_id, f"<< /Type /Pages /Count 1 /Kids [{mapping[page_id]} 0 R] >>")
+            catalog_id = stream.add_packed(f"<< /Type /Catalog /Pages {pages_id} 0 R >>")
+            stream.finish(catalog_id)
+
+    def write_pages(self, indexes: Iterable[int], preview_dir: Path) -> list[Path]:
+        paths: list[Path] = []
+        for index in indexes:
+            path = preview_dir / f"page-{index + 1:03d}.pdf"
+            self.write_page(index, path)
+            paths.append(path)
+        return paths
+
+    def split(self, preview_dir: Path, *, jobs: int = 1) -> list[Path]:
+        preview_dir.mkdir(parents=True, exist_ok=True)
+        indexes = range(len(self.page_ids))
+        if jobs <= 1 or len(indexes) < 2:
+            return self.write_pages(indexes, preview_dir)
+
+        chunks = [indexes[start::jobs] for start in range(min(jobs, len(indexes)))]
+        paths: dict[int, Path] = {}
+        # Spawn, not fork: build_docs.py gets here from a worker thread, and forking a threaded process can deadlock.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context) as pool:
+            futures = [
+                pool.submit(write_preview_chunk, self.source, list(chunk), preview_dir)
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                paths.update(zip(chunk, future.result()))
+        return [paths[index] for index in indexes]
+
+
+@dataclass(frozen=True)
+class SectionFragment:
+    ops: tuple[tuple[tuple, ...], ...]
+    page_extents: tuple[float, ...]
+    sections: tuple[tuple[str, int, float], ...]
+    cursor_y: float
+
+
+class SectionCache:
+    def __init__(self, path: Path | None, salt: str) -> None:
+        self.path = path
+        self.salt = salt
+        self.entries: dict[str, SectionFragment] = {}
+        self.used: dict[str, SectionFragment] = {}
+        self.hits = 0
+        self.misses = 0
+        if path is not None and path.is_file():
+            # The salt line is checked before anything is unpickled, so a cache written by other code is never loaded.
+            try:
+                with path.open("rb") as handle:
+                    if handle.readline() == self._salt_line():
+                        stored = pickle.load(handle)
+                    else:
+                        stored = None
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+                stored = None
+            if isinstance(stored, dict):
+                self.entries = {key: SectionFragment(*fields) for key, fields in stored.items()}
+
+    def _salt_line(self) -> bytes:
+        return f"section-cache {self.salt}\n".encode("utf-8")
+
+    def key(self, name: str, inputs: tuple, cursor_y: float) -> str:
+        payload = json.dumps([name, inputs, cursor_y], default=repr, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> SectionFragment | None:
+        fragment = self.entries.get(key)
+        if fragment is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.used[key] = fragment
+        return fragment
+
+    def put(self, key: str, fragment: SectionFragment) -> None:
+        self.entries[key] = fragment
+        self.used[key] = fragment
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("wb") as handle:
+            handle.write(self._salt_line())
+            # Plain tuples rather than SectionFragment, which pickles as __main__.SectionFragment in a standalone
+            # build and could not be loaded by build_docs.py or any other importer.
+            entries = {
+                key: (fragment.ops, fragment.page_extents, fragment.sections, fragment.cursor_y)
+                for key, fragment in self.used.items()
+            }
+            pickle.dump(entries, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@dataclass(frozen=True)
+class SectionMark:
+    title: str
+    page: int
+    y: float
+
+
+@dataclass(frozen=True)
+class LayoutMeasurement:
+    page_count: int
+    page_extents: tuple[float, ...]
+    sections: tuple[SectionMark, ...]
 
 
 class LayoutDocument:
-    def __init__(self, title: str, subtitle: str) -> None:
+    def __init__(
+        self,
+        title: str,
+        subtitle: str,
+        *,
+        measure_only: bool = False,
+        section_cache: SectionCache | None = None,
+    ) -> None:
         self.title = title
         self.subtitle = subtitle
+        self.measure_only = measure_only
+        self.section_cache = None if measure_only else section_cache
         self.pages: list[PDFPage] = []
+        self.page_extents: list[float] = []
+        self.sections: list[SectionMark] = []
+        self.forms = {} if measure_only else self.chrome_forms()
         self.cursor_y = TOP_MARGIN + HEADER_HEIGHT
         self.new_page()
 
+    def chrome_forms(self) -> dict[str, PDFPage]:
+        background = PDFPage()
+        background.fill_rect(WHITE, 0, 0, PAGE_WIDTH, PAGE_HEIGHT)
+
+        footer = PDFPage()
+        footer_rule_y = PAGE_HEIGHT - BOTTOM_MARGIN - FOOTER_HEIGHT + 4
+        footer.stroke_line(RULE, 0.5, LEFT_MARGIN, footer_rule_y, PAGE_WIDTH - RIGHT_MARGIN, footer_rule_y)
+        add_text(
+            footer,
+            LEFT_MARGIN,
+            PAGE_HEIGHT - BOTTOM_MARGIN - 12,
+            "Generated from workflow-sorted LiveAPI inventory",
+            font="F1",
+            size=8.5,
+            color=MUTED,
+        )
+
+        cover = PDFPage()
+        cover.fill_rect(SOFT_FILL, 0, 0, PAGE_WIDTH, TOP_MARGIN + 12)
+        cover.extend(footer.ops)
+
+        chrome = PDFPage()
+        header_rule_y = TOP_MARGIN + HEADER_HEIGHT - 6
+        chrome.stroke_line(RULE, 0.5, LEFT_MARGIN, header_rule_y, PAGE_WIDTH - RIGHT_MARGIN, header_rule_y)
+        add_text(
+            chrome,
+            LEFT_MARGIN,
+            TOP_MARGIN + 4,
+            self.title,
+            font="F2",
+            size=10,
+            color=MUTED,
+        )
+        add_text(
+            chrome,
+            PAGE_WIDTH - RIGHT_MARGIN - 110,
+            TOP_MARGIN + 4,
+            self.subtitle,
+            font="F1",
+            size=8.5,
+            color=MUTED,
+        )
+        chrome.extend(footer.ops)
+        return {"Background": background, "CoverChrome": cover, "PageChrome": chrome}
+
     def new_page(self) -> None:
-        page = PDFPage()
-        page.add(f"{color_fill(WHITE)}{rect_cmd(0, 0, PAGE_WIDTH, PAGE_HEIGHT)}")
+        if self.pages:
+            if ACTIVE_PROFILE is not None:
+                ACTIVE_PROFILE.count("page_breaks")
+            self.page_extents.append(self.cursor_y)
+        page = PDFPage(recording=not self.measure_only)
+        page.form("Background")
         self.pages.append(page)
         self.cursor_y = TOP_MARGIN + HEADER_HEIGHT
 
+    def cached_section(self, render: Callable[..., None], *inputs: object) -> None:
+        cache = self.section_cache
+        if cache is None:
+            render(self, *inputs)
+            return
+
+        key = cache.key(render.__qualname__, inputs, self.cursor_y)
+        start_page = len(self.pages) - 1
+        fragment = cache.get(key)
+        if fragment is not None:
+            self.page.extend(fragment.ops[0])
+            for ops in fragment.ops[1:]:
+                page = PDFPage()
+                page.extend(ops)
+                self.pages.append(page)
+            self.page_extents.extend(fragment.page_extents)
+            self.sections.extend(
+                SectionMark(title, start_page + offset + 1, y) for title, offset, y in fragment.sections
+            )
+            self.cursor_y = fragment.cursor_y
+            return
+
+        start_ops = len(self.page.ops)
+        start_extents = len(self.page_extents)
+        start_sections = len(self.sections)
+        render(self, *inputs)
+        cache.put(
+            key,
+            SectionFragment(
+                ops=(
+                    tuple(self.pages[start_page].ops[start_ops:]),
+                    *(tuple(page.ops) for page in self.pages[start_page + 1 :]),
+                ),
+                page_extents=tuple(self.page_extents[start_extents:]),
+                sections=tuple(
+                    (mark.title, mark.page - start_page - 1, mark.y) for mark in self.sections[start_sections:]
+                ),
+                cursor_y=self.cursor_y,
+            ),
+        )
+
+    def measurement(self) -> LayoutMeasurement:
+        return LayoutMeasurement(
+            page_count=len(self.pages),
+            page_extents=(*self.page_extents, self.cursor_y),
+            sections=tuple(self.sections),
+        )
+
     @property
     def page(self) -> PDFPage:
         return self.pages[-1]
@@ -318,45 +1220,7 @@ class LayoutDocument:
     def add_header_footer(self) -> None:
         page_total = len(self.pages)
         for index, page in enumerate(self.pages, start=1):
-            if index == 1:
-                header_fill = color_fill(SOFT_FILL)
-                page.add(
-                    f"{header_fill}{rect_cmd(0, 0, PAGE_WIDTH, TOP_MARGIN + 12)}"
-                )
-            else:
-                page.add(
-                    f"{color_stroke(RULE)}0.5 w {line_cmd(LEFT_MARGIN, TOP_MARGIN + HEADER_HEIGHT - 6, PAGE_WIDTH - RIGHT_MARGIN, TOP_MARGIN + HEADER_HEIGHT - 6)}"
-                )
-                add_text(
-                    page,
-                    LEFT_MARGIN,
-                    TOP_MARGIN + 4,
-                    self.title,
-                    font="F2",
-                    size=10,
-                    color=MUTED,
-                )
-                add_text(
-                    page,
-                    PAGE_WIDTH - RIGHT_MARGIN - 110,
-                    TOP_MARGIN + 4,
-                    self.subtitle,
-                    font="F1",
-                    size=8.5,
-                    color=MUTED,
-                )
-            page.add(
-                f"{color_stroke(RULE)}0.5 w {line_cmd(LEFT_MARGIN, PAGE_HEIGHT - BOTTOM_MARGIN - FOOTER_HEIGHT + 4, PAGE_WIDTH - RIGHT_MARGIN, PAGE_HEIGHT - BOTTOM_MARGIN - FOOTER_HEIGHT + 4)}"
-            )
-            add_text(
-                page,
-                LEFT_MARGIN,
-                PAGE_HEIGHT - BOTTOM_MARGIN - 12,
-                "Generated from workflow-sorted LiveAPI inventory",
-                font="F1",
-                size=8.5,
-                color=MUTED,
-            )
+            page.form("CoverChrome" if index == 1 else "PageChrome")
             add_text(
                 page,
                 PAGE_WIDTH - RIGHT_MARGIN - 54,
@@ -368,8 +1232,8 @@ class LayoutDocument:
             )
 
     def title_page(self, generated_on: str) -> None:
-        self.page.add(f"{color_fill(SOFT_FILL)}{rect_cmd(0, 0, PAGE_WIDTH, 210)}")
-        self.page.add(f"{color_fill(ACCENT)}{rect_cmd(LEFT_MARGIN, 86, 8, 88)}")
+        self.page.fill_rect(SOFT_FILL, 0, 0, PAGE_WIDTH, 210)
+        self.page.fill_rect(ACCENT, LEFT_MARGIN, 86, 8, 88)
         add_text_lines(
             self.page,
             LEFT_MARGIN + 22,
@@ -438,8 +1302,9 @@ class LayoutDocument:
     def section_title(self, text: str) -> None:
         self.ensure_space(28)
         y = self.cursor_y
-        self.page.add(f"{color_fill(SOFT_FILL)}{rect_cmd(LEFT_MARGIN, y, CONTENT_WIDTH, 20)}")
-        self.page.add(f"{color_fill(ACCENT)}{rect_cmd(LEFT_MARGIN, y, 6, 20)}")
+        self.sections.append(SectionMark(text, len(self.pages), y))
+        self.page.fill_rect(SOFT_FILL, LEFT_MARGIN, y, CONTENT_WIDTH, 20)
+        self.page.fill_rect(ACCENT, LEFT_MARGIN, y, 6, 20)
         add_text(self.page, LEFT_MARGIN + 14, y + 4, text, font="F2", size=13, color=INK)
         self.cursor_y += 28
 
@@ -502,8 +1367,8 @@ class LayoutDocument:
         height = 22 + len(lines) * 13.0 + 10
         self.ensure_space(height)
         y = self.cursor_y
-        self.page.add(f"{color_fill(SOFT_FILL)}{rect_cmd(LEFT_MARGIN, y, CONTENT_WIDTH, height)}")
-        self.page.add(f"{color_stroke(ACCENT)}1 w {rect_outline_cmd(LEFT_MARGIN, y, CONTENT_WIDTH, height)}")
+        self.page.fill_rect(SOFT_FILL, LEFT_MARGIN, y, CONTENT_WIDTH, height)
+        self.page.stroke_rect(ACCENT, 1, LEFT_MARGIN, y, CONTENT_WIDTH, height)
         add_text(self.page, LEFT_MARGIN + 12, y + 8, title, font="F2", size=11, color=ACCENT_DARK)
         add_text_lines(
             self.page,
@@ -532,30 +1397,42 @@ class LayoutDocument:
     ) -> None:
         if abs(sum(widths) - CONTENT_WIDTH) > 0.2:
             raise ValueError("table widths must equal content width")
+        if ACTIVE_PROFILE is not None:
+            ACTIVE_PROFILE.count("table_rows", len(rows))
+
+        wrap_cache: dict[tuple[str, float, float, str], list[str]] = {}
+
+        def wrap_cell(text: str, width: float, size: float, font: str) -> list[str]:
+            key = (text, width, size, font)
+            lines = wrap_cache.get(key)
+            if lines is None:
+                lines = wrap_text(text, width - 8, size, font=font) or [""]
+                wrap_cache[key] = lines
+            return lines
 
         def row_metrics(cells: list[str], font: str, size: float) -> tuple[list[list[str]], float]:
             wrapped: list[list[str]] = []
             max_lines = 1
             for cell, width in zip(cells, widths):
-                lines = wrap_text(cell, width - 8, size, font=font) or [""]
+                lines = wrap_cell(cell, width, size, font)
                 wrapped.append(lines)
                 max_lines = max(max_lines, len(lines))
             return wrapped, max_lines * body_leading + 8
 
+        header_lines = [wrap_cell(cell, width, header_size, header_font) for cell, width in zip(headers, widths)]
+        header_height = max((len(lines) for lines in header_lines), default=1) * (header_size + 1.8) + 8
+
         def draw_header() -> None:
-            header_lines: list[list[str]] = []
-            max_lines = 1
-            for cell, width in zip(headers, widths):
-                lines = wrap_text(cell, width - 8, header_size, font=header_font) or [""]
-                header_lines.append(lines)
-                max_lines = max(max_lines, len(lines))
-            height = max_lines * (header_size + 1.8) + 8
+            height = header_height
             self.ensure_space(height)
             y = self.cursor_y
             x = LEFT_MARGIN
+            for width in widths:
+                self.page.fill_rect(SOFT_FILL, x, y, width, height)
+                self.page.stroke_rect(RULE, 0.5, x, y, width, height)
+                x += width
+            x = LEFT_MARGIN
             for cell_lines, width in zip(header_lines, widths):
-                self.page.add(f"{color_fill(SOFT_FILL)}{rect_cmd(x, y, width, height)}")
-                self.page.add(f"{color_stroke(RULE)}0.5 w {rect_outline_cmd(x, y, width, height)}")
                 add_text_lines(
                     self.page,
                     x + 4,
@@ -580,8 +1457,11 @@ class LayoutDocument:
                     draw_header()
             y = self.cursor_y
             x = LEFT_MARGIN
+            for width in widths:
+                self.page.stroke_rect(RULE, 0.45, x, y, width, height)
+                x += width
+            x = LEFT_MARGIN
             for cell_lines, width in zip(wrapped_cells, widths):
-                self.page.add(f"{color_stroke(RULE)}0.45 w {rect_outline_cmd(x, y, width, height)}")
                 add_text_lines(
                     self.page,
                     x + 4,
@@ -596,6 +1476,7 @@ class LayoutDocument:
             self.cursor_y += height
 
 
+@lru_cache(maxsize=8192)
 def pdf_num(value: float) -> str:
     text = f"{value:.2f}"
     return text.rstrip("0").rstrip(".")
@@ -605,6 +1486,7 @@ def pdf_escape(text: str) -> str:
     return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
 
 
+@lru_cache(maxsize=256)
 def rgb(color: tuple[float, float, float]) -> str:
     return " ".join(pdf_num(part) for part in color)
 
@@ -634,6 +1516,122 @@ def line_cmd(x1: float, y1: float, x2: float, y2: float) -> str:
     )
 
 
+def form_cmd(name: str) -> str:
+    return f"/{name} Do"
+
+
+@dataclass
+class TextState:
+    fill: str | None = None
+    font: str | None = None
+    leading: str | None = None
+
+
+def td_offset(delta: float) -> str:
+    return pdf_num(round(delta, 2) + 0.0)
+
+
+def text_block(ops: list[tuple], state: TextState) -> str:
+    runs = ["BT"]
+    line_x = line_y = 0.0
+    for op in ops:
+        if op[0] == OP_TEXT:
+            _, font, size, color, x, y, text = op
+            leading, lines = None, [text]
+        else:
+            _, font, size, leading, color, x, y, lines = op
+        commands = []
+        fill = rgb(color)
+        if fill != state.fill:
+            commands.append(f"{fill} rg")
+            state.fill = fill
+        selection = f"/{font} {pdf_num(size)} Tf"
+        if selection != state.font:
+            commands.append(selection)
+            state.font = selection
+        if len(lines) > 1 and pdf_num(leading) != state.leading:
+            state.leading = pdf_num(leading)
+            commands.append(f"{state.leading} TL")
+        x = float(pdf_num(x))
+        baseline = float(pdf_num(PAGE_HEIGHT - y - size))
+        commands.append(f"{td_offset(x - line_x)} {td_offset(baseline - line_y)} Td")
+        line_x, line_y = x, baseline
+        first, *rest = lines
+        commands.append(f"({pdf_escape(first)}) Tj")
+        for line in rest:
+            commands.append(f"T* ({pdf_escape(line)}) Tj")
+            line_y -= float(state.leading)
+        runs.append(" ".join(commands))
+    runs.append("ET")
+    return "\n".join(runs)
+
+
+def render_ops(ops: list[tuple]) -> list[str]:
+    parts = []
+    state = TextState()
+    index = 0
+    while index < len(ops):
+        kind = ops[index][0]
+        if kind in TEXT_OPS:
+            end = index + 1
+            while end < len(ops) and ops[end][0] in TEXT_OPS:
+                end += 1
+            parts.append(text_block(ops[index:end], state))
+            index = end
+            continue
+        if kind == OP_FILL_RECT:
+            state.fill = rgb(ops[index][1])
+        elif kind == OP_RAW:
+            state = TextState()
+        parts.append(render_op(ops[index]))
+        index += 1
+    return parts
+
+
+def render_op(op: tuple) -> str:
+    kind = op[0]
+    assert kind not in TEXT_OPS, "text ops are rendered by text_block"
+    if kind == OP_STROKE_RECT:
+        _, color, line_width, x, y, width, height = op
+        return f"{color_stroke(color)}{pdf_num(line_width)} w {rect_outline_cmd(x, y, width, height)}"
+    if kind == OP_FILL_RECT:
+        _, color, x, y, width, height = op
+        return f"{color_fill(color)}{rect_cmd(x, y, width, height)}"
+    if kind == OP_STROKE_LINE:
+        _, color, line_width, x1, y1, x2, y2 = op
+        return f"{color_stroke(color)}{pdf_num(line_width)} w {line_cmd(x1, y1, x2, y2)}"
+    if kind == OP_FORM:
+        return form_cmd(op[1])
+    if kind == OP_RAW:
+        return op[1]
+    raise ValueError(f"unknown drawing op {kind!r}")
+
+
+def pdf_dict_end(data: bytes, start: int) -> int:
+    depth = 0
+    position = start
+    while True:
+        opening = data.find(b"<<", position)
+        closing = data.find(b">>", position)
+        if closing < 0:
+            raise ValueError("unterminated PDF dictionary")
+        if 0 <= opening < closing:
+            depth += 1
+            position = opening + 2
+        else:
+            depth -= 1
+            position = closing + 2
+            if depth == 0:
+                return position
+
+
+def renumber_references(body: bytes, mapping: dict[int, int]) -> bytes:
+    return REFERENCE_PATTERN.sub(
+        lambda match: f"{mapping[int(match.group(1))]} 0 R".encode("utf-8"),
+        body,
+    )
+
+
 def add_text(
     page: PDFPage,
     x: float,
@@ -644,12 +1642,8 @@ def add_text(
     size: float,
     color: tuple[float, float, float],
 ) -> None:
-    baseline = PAGE_HEIGHT - y - size
-    page.add(
-        f"BT {rgb(color)} rg /{font} {pdf_num(size)} Tf "
-        f"1 0 0 1 {pdf_num(x)} {pdf_num(baseline)} Tm "
-        f"({pdf_escape(text)}) Tj ET"
-    )
+    if page.recording:
+        page.ops.append((OP_TEXT, font, size, color, x, y, text))
 
 
 def add_text_lines(
@@ -663,155 +1657,114 @@ def add_text_lines(
     leading: float,
     color: tuple[float, float, float],
 ) -> None:
-    if not lines:
-        lines = [""]
-    baseline = PAGE_HEIGHT - y - size
-    commands = [
-        "BT",
-        f"{rgb(color)} rg",
-        f"/{font} {pdf_num(size)} Tf",
-        f"{pdf_num(leading)} TL",
-        f"1 0 0 1 {pdf_num(x)} {pdf_num(baseline)} Tm",
-    ]
-    first, *rest = lines
-    commands.append(f"({pdf_escape(first)}) Tj")
-    for line in rest:
-        commands.append("T*")
-        commands.append(f"({pdf_escape(line)}) Tj")
-    commands.append("ET")
-    page.add(" ".join(commands))
+    if page.recording:
+        page.ops.append((OP_TEXT_LINES, font, size, leading, color, x, y, lines or [""]))
+
+
+@lru_cache(maxsize=65536)
+def text_width_units(text: str, font: str) -> int:
+    widths = FONT_GLYPH_WIDTHS[font]
+    return sum(map(widths.__getitem__, text.encode("latin-1", "replace")))
 
 
 def measure_text(text: str, size: float, font: str) -> float:
-    if font in {"F3", "F4"}:
-        return len(text) * size * 0.6
-    total = 0.0
-    for char in text:
-        if char == " ":
-            total += 0.28
-        elif char in "ilI.,:;!'|":
-            total += 0.25
-        elif char in "mwMW@%#&Q":
-            total += 0.86
-        elif char.isupper():
-            total += 0.68
-        elif char.isdigit():
-            total += 0.56
-        else:
-            total += 0.53
-    return total * size
+    if ACTIVE_PROFILE is not None:
+        ACTIVE_PROFILE.count("measure_text")
+    return text_width_units(text, font) * size / 1000
 
 
 def wrap_text(text: str, width: float, size: float, *, font: str) -> list[str]:
-    text = " ".join(text.split())
-    if not text:
+    words = text.split()
+    if ACTIVE_PROFILE is not None:
+        ACTIVE_PROFILE.count("wrap_text")
+        ACTIVE_PROFILE.count("measure_text", len(words))
+    if not words:
         return [""]
 
-    words = text.split(" ")
+    space_units = text_width_units(" ", font)
     lines: list[str] = []
-    current = words[0]
+    current = [words[0]]
+    current_units = text_width_units(words[0], font)
     for word in words[1:]:
-        candidate = f"{current} {word}"
-        if measure_text(candidate, size, font) <= width:
-            current = candidate
+        word_units = text_width_units(word, font)
+        if (current_units + space_units + word_units) * size / 1000 <= width:
+            current.append(word)
+            current_units += space_units + word_units
             continue
-        if measure_text(word, size, font) > width:
+        lines.append(" ".join(current))
+        if word_units * size / 1000 > width:
             split_word = split_long_token(word, width, size, font)
-            if current:
-                lines.append(current)
             lines.extend(split_word[:-1])
-            current = split_word[-1]
-            continue
-        lines.append(current)
-        current = word
-    if current:
-        lines.append(current)
+            word = split_word[-1]
+            word_units = text_width_units(word, font)
+        current = [word]
+        current_units = word_units
+    lines.append(" ".join(current))
     return lines
 
 
 def split_long_token(token: str, width: float, size: float, font: str) -> list[str]:
+    widths = FONT_GLYPH_WIDTHS[font]
     pieces: list[str] = []
-    current = ""
-    for char in token:
-        candidate = current + char
-        if current and measure_text(candidate, size, font) > width:
-            pieces.append(current)
-            current = char
-        else:
-            current = candidate
-    if current:
-        pieces.append(current)
+    start = 0
+    current_units = 0
+    for index, code in enumerate(token.encode("latin-1", "replace")):
+        char_units = widths[code]
+        if index > start and (current_units + char_units) * size / 1000 > width:
+            pieces.append(token[start:index])
+            start = index
+            current_units = 0
+        current_units += char_units
+    if start < len(token):
+        pieces.append(token[start:])
     return pieces or [token]
 
 
-def friendly_object_name(object_name: str) -> str:
-    return {
-        "Song.View": "selection",
-        "Song": "song",
-        "Scene": "scene",
-        "Track": "track",
-        "Track.View": "track view",
-        "ClipSlot": "clip slot",
-        "Clip": "clip",
-        "Clip.View": "clip view",
-        "MixerDevice": "mixer",
-        "DeviceParameter": "parameter",
-    }.get(object_name, object_name.lower())
-
-
-def readable_label(row: dict[str, str]) -> str:
-    object_name = row["object"]
-    name = row["member_name"]
-    object_prefix = friendly_object_name(object_name)
-    special = {
-        ("Song", "name"): "Set name",
-        ("Scene", "name"): "Scene name",
-        ("Track", "name"): "Track name",
-        ("Clip", "name"): "Clip name",
-        ("DeviceParameter", "name"): "Parameter name",
-        ("Song", "view"): "Song view",
-        ("Track", "view"): "Track view",
-        ("Clip", "view"): "Clip view",
-        ("Track", "clip_slots"): "Track clip slots",
-        ("Scene", "clip_slots"): "Scene clip slots",
-        ("ClipSlot", "clip"): "Clip in slot",
-        ("Track", "devices"): "Track devices",
-        ("Track", "mixer_device"): "Track mixer device",
-        ("Song", "tracks"): "Track list",
-        ("Song", "visible_tracks"): "Visible track list",
-        ("Song", "scenes"): "Scene list",
-        ("Song", "return_tracks"): "Return track list",
-        ("Song", "master_track"): "Master track",
-        ("Song.View", "selected_track"): "Selected track",
-        ("Song.View", "selected_scene"): "Selected scene",
-        ("Song.View", "selected_parameter"): "Selected parameter",
-        ("Song.View", "selected_chain"): "Selected chain",
-        ("Song.View", "highlighted_clip_slot"): "Highlighted clip slot",
-        ("Song.View", "detail_clip"): "Detail clip",
-        ("Song", "appointed_device"): "Appointed device",
-        ("Track.View", "selected_device"): "Selected device",
-        ("Track.View", "selected_track"): "Selected track in view",
-        ("Track.View", "visible_tracks"): "Visible tracks in view",
-        ("Clip", "available_warp_modes"): "Available warp modes",
-        ("Clip.View", "show_warp_as"): "Show warp as",
-        ("MixerDevice", "track_activator"): "Track activator",
-        ("DeviceParameter", "display_value"): "Display value",
-        ("Song", "is_ableton_link_enabled"): "Ableton Link enabled",
-        ("Song", "is_ableton_link_start_stop_sync_enabled"): "Ableton Link start/stop sync enabled",
-        ("Song", "clip_trigger_quantization"): "Clip trigger quantization",
-        ("Song", "session_automation_record"): "Session automation record",
-        ("Song", "session_record_status"): "Session record status",
-        ("ClipSlot", "has_stop_button"): "Slot has stop button",
-        ("ClipSlot", "controls_other_clips"): "Controls other clips",
-        ("ClipSlot", "will_record_on_start"): "Will record on start",
-        ("Track", "fired_slot_index"): "Fired slot index",
-        ("Track", "playing_slot_index"): "Playing slot index",
-        ("Track", "input_meter_level"): "Input meter level",
-        ("Track", "output_meter_level"): "Output meter level",
-    }
-    if (object_name, name) in special:
-        return special[(object_name, name)]
+class InventoryRow(NamedTuple):
+    layer: str
+    object: str
+    canonical_path: str
+    member_type: str
+    member_name: str
+    workflow_id: str = ""
+    workflow_title: str = ""
+    workflow_order: int = 0
+    palette_lane: str = ""
+    priority_tier: str = ""
+    accessible_label: str = ""
+    context_label: str = ""
+    blind_vi_purpose: str = ""
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, str]) -> InventoryRow:
+        return cls(
+            sys.intern(record["layer"]),
+            sys.intern(record["object"]),
+            sys.intern(record["canonical_path"]),
+            sys.intern(record["member_type"]),
+            record["member_name"],
+        )
+
+
+class BetaTermRow(NamedTuple):
+    workflow_group: str
+    term: str
+    kind: str
+    current_surface: str
+    notes: str
+
+    @classmethod
+    def from_record(cls, record: Mapping[str, str]) -> BetaTermRow:
+        return cls(
+            sys.intern(record["workflow_group"]),
+            record["term"],
+            sys.intern(record["kind"]),
+            sys.intern(record["current_surface"]),
+            record["notes"],
+        )
 
+
+def fallback_label(object_prefix: str, name: str) -> str:
     if name in {"name", "color", "color_index"}:
         return f"{object_prefix} {name.replace('_', ' ')}".title()
     if name == "view":
@@ -825,309 +1778,168 @@ def readable_label(row: dict[str, str]) -> str:
     return name.replace("_", " ").title()
 
 
-def short_context(row: dict[str, str]) -> str:
-    path = row["canonical_path"].replace("live_set ", "")
-    member_kind = "child" if row["member_type"] == "child" else "prop"
-    return f"{row['object']} {member_kind} @ {path}"
-
-
-def classify_workflow(row: dict[str, str]) -> str:
-    object_name = row["object"]
-    member = row["member_name"]
-
-    if object_name == "Song.View":
-        if member in {"selected_chain", "selected_parameter"}:
-            return "track_device_routing_architecture"
-        if member == "follow_song":
-            return "launch_performance_state"
-        return "orientation_set_scanning"
-
-    if object_name == "Song":
-        if member in {"appointed_device"}:
-            return "track_device_routing_architecture"
-        if member in {
-            "arrangement_overdub",
-            "can_capture_midi",
-            "count_in_duration",
-            "is_counting_in",
-            "overdub",
-            "punch_in",
-            "punch_out",
-            "record_mode",
-            "session_record",
-            "session_record_status",
-        }:
-            return "recording_capture_safety"
-        if member in {
-            "clip_trigger_quantization",
-            "current_song_time",
-            "groove_amount",
-            "last_event_time",
-            "loop",
-            "loop_length",
-            "loop_start",
-            "metronome",
-            "midi_recording_quantization",
-            "signature_denominator",
-            "signature_numerator",
-            "song_length",
-            "start_time",
-            "swing_amount",
-            "tempo",
-        }:
-            return "timing_loop_grid_control"
-        if member in {
-            "can_jump_to_next_cue",
-            "can_jump_to_prev_cue",
-            "can_redo",
-            "can_undo",
-            "exclusive_arm",
-            "exclusive_solo",
-            "file_path",
-            "is_ableton_link_enabled",
-            "is_ableton_link_start_stop_sync_enabled",
-            "name",
-            "nudge_down",
-            "nudge_up",
-            "re_enable_automation_enabled",
-            "root_note",
-            "scale_intervals",
-            "scale_mode",
-            "scale_name",
-            "select_on_launch",
-            "session_automation_record",
-            "tempo_follower_enabled",
-        }:
-            return "global_session_governance"
-        if member in {
-            "cue_points",
-            "master_track",
-            "return_tracks",
-            "scenes",
-            "tracks",
-            "visible_tracks",
-            "view",
-            "groove_pool",
-            "tuning_system",
-        }:
-            return "orientation_set_scanning"
-        if member in {"back_to_arranger", "is_playing"}:
-            return "launch_performance_state"
-
-    if object_name == "Scene":
-        if member in {
-            "tempo",
-            "tempo_enabled",
-            "time_signature_numerator",
-            "time_signature_denominator",
-            "time_signature_enabled",
-        }:
-            return "timing_loop_grid_control"
-        if member == "is_triggered":
-            return "launch_performance_state"
-        return "orientation_set_scanning"
-
-    if object_name == "Track":
-        if member in {"arm", "can_be_armed", "implicit_arm"}:
-            return "recording_capture_safety"
-        if member in {
-            "input_meter_left",
-            "input_meter_level",
-            "input_meter_right",
-            "mute",
-            "muted_via_solo",
-            "output_meter_left",
-            "output_meter_level",
-            "output_meter_right",
-            "performance_impact",
-            "solo",
-        }:
-            return "mixer_metering_balance"
-        if member in {"fired_slot_index", "playing_slot_index", "back_to_arranger"}:
-            return "launch_performance_state"
-        if member in {"name", "color", "color_index", "is_part_of_selection", "is_visible", "clip_slots"}:
-            return "orientation_set_scanning"
-        return "track_device_routing_architecture"
-
-    if object_name == "Track.View":
-        if member in {"selected_track", "visible_tracks"}:
-            return "orientation_set_scanning"
-        return "track_device_routing_architecture"
-
-    if object_name == "ClipSlot":
-        if member in {"is_playing", "is_recording", "is_triggered", "playing_status"}:
-            return "launch_performance_state"
-        if member == "will_record_on_start":
-            return "recording_capture_safety"
-        return "clip_scene_discovery"
-
-    if object_name == "Clip":
-        if member in {"is_playing", "is_triggered", "playing_position", "playing_status", "position"}:
-            return "launch_performance_state"
-        if member in {"is_recording", "is_overdubbing"}:
-            return "recording_capture_safety"
-        if member in {
-            "end_marker",
-            "end_time",
-            "groove",
-            "launch_mode",
-            "launch_quantization",
-            "legato",
-            "length",
-            "loop_end",
-            "loop_jump",
-            "loop_start",
-            "looping",
-            "pitch_coarse",
-            "pitch_fine",
-            "sample_length",
-            "sample_rate",
-            "start_marker",
-            "start_time",
-            "velocity_amount",
-            "warp_mode",
-            "warping",
-            "available_warp_modes",
-        }:
-            return "timing_loop_grid_control"
-        if member in {"gain", "gain_display_string"}:
-            return "mixer_metering_balance"
-        return "clip_scene_discovery"
-
-    if object_name == "Clip.View":
-        return "timing_loop_grid_control"
-
-    if object_name in {"MixerDevice", "DeviceParameter"}:
-        return "mixer_metering_balance"
-
-    return "global_session_governance"
-
-
-def classify_priority(row: dict[str, str], workflow_id: str) -> str:
-    object_name = row["object"]
-    member = row["member_name"]
-
-    core_by_workflow = {
-        "orientation_set_scanning": {
-            "highlighted_clip_slot",
-            "selected_scene",
-            "selected_track",
-            "tracks",
-            "scenes",
-            "visible_tracks",
-            "name",
-            "is_visible",
-            "is_part_of_selection",
-        },
-        "clip_scene_discovery": {
-            "clip",
-            "clip_slots",
-            "has_clip",
-            "has_stop_button",
-            "is_empty",
-            "is_audio_clip",
-            "is_midi_clip",
-            "name",
-        },
-        "launch_performance_state": {
-            "back_to_arranger",
-            "fired_slot_index",
-            "follow_song",
-            "is_playing",
-            "is_triggered",
-            "playing_position",
-            "playing_slot_index",
-            "playing_status",
-            "position",
-            "select_on_launch",
-        },
-        "recording_capture_safety": {
-            "arm",
-            "can_be_armed",
-            "is_recording",
-            "overdub",
-            "record_mode",
-            "session_record",
-            "session_record_status",
-            "will_record_on_start",
-        },
-        "timing_loop_grid_control": {
-            "clip_trigger_quantization",
-            "current_song_time",
-            "grid_quantization",
-            "launch_quantization",
-            "length",
-            "loop_end",
-            "loop_start",
-            "looping",
-            "metronome",
-            "signature_denominator",
-            "signature_numerator",
-            "tempo",
-        },
-        "mixer_metering_balance": {
-            "cue_volume",
-            "display_value",
-            "input_meter_level",
-            "mute",
-            "output_meter_level",
-            "panning",
-            "solo",
-            "track_activator",
-            "value",
-            "volume",
-        },
-        "track_device_routing_architecture": {
-            "appointed_device",
-            "devices",
-            "group_track",
-            "input_routing_channel",
-            "input_routing_type",
-            "output_routing_channel",
-            "output_routing_type",
-            "selected_chain",
-            "selected_device",
-            "selected_parameter",
-        },
-        "global_session_governance": {
-            "can_jump_to_next_cue",
-            "can_jump_to_prev_cue",
-            "can_redo",
-            "can_undo",
-            "exclusive_arm",
-            "exclusive_solo",
-            "is_ableton_link_enabled",
-            "is_ableton_link_start_stop_sync_enabled",
-            "re_enable_automation_enabled",
-            "session_automation_record",
-        },
-    }
+class LabelTable:
+    def __init__(self, object_names: Mapping[str, str], labels: Mapping[tuple[str, str], str]) -> None:
+        self.object_names = MappingProxyType(dict(object_names))
+        self.labels = MappingProxyType(dict(labels))
+        self._resolved: dict[tuple[str, str], str] = {}
+
+    @classmethod
+    def from_mapping(cls, data: dict) -> LabelTable:
+        return cls(
+            data.get("objects", {}),
+            {
+                (object_name, member): label
+                for object_name, members in data.get("members", {}).items()
+                for member, label in members.items()
+            },
+        )
 
-    deep_names = {
-        "automation_state",
-        "color_index",
-        "default_value",
-        "draw_mode",
-        "groove_pool",
-        "last_event_time",
-        "max",
-        "min",
-        "original_name",
-        "performance_impact",
-        "sample_length",
-        "sample_rate",
-        "state",
-        "tuning_system",
-        "value_items",
-    }
+    def with_overrides(self, labels: Mapping[tuple[str, str], str]) -> LabelTable:
+        return LabelTable(self.object_names, {**self.labels, **labels})
+
+    def object_name(self, object_name: str) -> str:
+        return self.object_names.get(object_name, object_name.lower())
+
+    def resolve(self, object_name: str, member: str) -> str:
+        key = (object_name, member)
+        label = self._resolved.get(key)
+        if label is None:
+            label = self.labels.get(key)
+            if label is None:
+                label = fallback_label(self.object_name(object_name), member)
+            self._resolved[key] = label
+        return label
+
+    def resolve_rows(self, rows: Iterable[InventoryRow]) -> list[str]:
+        return [self.resolve(row.object, row.member_name) for row in rows]
+
+
+def load_label_table(path: Path = RULES_PATH) -> LabelTable:
+    with path.open(encoding="utf-8") as handle:
+        return LabelTable.from_mapping(json.load(handle)["labels"])
+
+
+LABEL_TABLE = load_label_table()
+
+
+def friendly_object_name(object_name: str, table: LabelTable = LABEL_TABLE) -> str:
+    return table.object_name(object_name)
+
+
+def readable_label(row: InventoryRow, table: LabelTable = LABEL_TABLE) -> str:
+    return table.resolve(row.object, row.member_name)
+
+
+def short_context(row: InventoryRow) -> str:
+    return context_label(row.object, row.member_type, row.canonical_path)
+
+
+@lru_cache(maxsize=4096)
+def context_label(object_name: str, member_type: str, canonical_path: str) -> str:
+    path = canonical_path.replace("live_set ", "")
+    member_kind = "child" if member_type == "child" else "prop"
+    return sys.intern(f"{object_name} {member_kind} @ {path}")
+
+
+class WorkflowRules:
+    def __init__(self, index: dict[tuple[str, str], str], defaults: dict[str, str], fallback: str) -> None:
+        self.index = index
+        self.defaults = defaults
+        self.fallback = fallback
+
+    @classmethod
+    def from_mapping(cls, data: dict) -> WorkflowRules:
+        fallback = data["fallback"]
+        index: dict[tuple[str, str], str] = {}
+        defaults: dict[str, str] = {}
+        for object_name, rules in data.get("objects", {}).items():
+            if "default" in rules:
+                defaults[object_name] = rules["default"]
+            for workflow_id, members in rules.get("members", {}).items():
+                for member in members:
+                    index.setdefault((object_name, member), workflow_id)
+
+        unknown = {fallback, *defaults.values(), *index.values()} - WORKFLOW_BY_ID.keys()
+        if unknown:
+            raise ValueError(f"workflow rules reference unknown workflows: {', '.join(sorted(unknown))}")
+        return cls(index, defaults, fallback)
+
+    def classify(self, object_name: str, member: str) -> str:
+        workflow_id = self.index.get((object_name, member))
+        if workflow_id is not None:
+            return workflow_id
+        return self.defaults.get(object_name, self.fallback)
+
+
+def load_workflow_rules(path: Path = RULES_PATH) -> WorkflowRules:
+    with path.open(encoding="utf-8") as handle:
+        return WorkflowRules.from_mapping(json.load(handle)["workflow"])
+
+
+WORKFLOW_RULES = load_workflow_rules()
+
+
+def classify_workflow(row: InventoryRow, rules: WorkflowRules = WORKFLOW_RULES) -> str:
+    return rules.classify(row.object, row.member_name)
+
+
+class PriorityIndex:
+    def __init__(
+        self,
+        core: frozenset[tuple[str, str]],
+        deep_members: frozenset[str],
+        deep_objects: Mapping[str, frozenset[str]],
+        default: str,
+    ) -> None:
+        self.core = core
+        self.deep_members = deep_members
+        self.deep_objects = deep_objects
+        self.default = default
+
+    @classmethod
+    def from_mapping(cls, data: dict) -> PriorityIndex:
+        unknown = set(data["core"]) - WORKFLOW_BY_ID.keys()
+        if unknown:
+            raise ValueError(f"priority rules reference unknown workflows: {', '.join(sorted(unknown))}")
+        return cls(
+            core=frozenset(
+                (workflow_id, member) for workflow_id, members in data["core"].items() for member in members
+            ),
+            deep_members=frozenset(data.get("deep_members", ())),
+            deep_objects=MappingProxyType(
+                {
+                    object_name: frozenset(rule.get("except", ()))
+                    for object_name, rule in data.get("deep_objects", {}).items()
+                }
+            ),
+            default=data["default"],
+        )
 
-    if member in core_by_workflow.get(workflow_id, set()):
-        return "core"
-    if member in deep_names:
-        return "deep"
-    if object_name == "DeviceParameter" and member not in {"display_value", "value"}:
-        return "deep"
-    return "extended"
+    def tier(self, workflow_id: str, object_name: str, member: str) -> str:
+        if (workflow_id, member) in self.core:
+            return "core"
+        if member in self.deep_members:
+            return "deep"
+        kept = self.deep_objects.get(object_name)
+        if kept is not None and member not in kept:
+            return "deep"
+        return self.default
+
+    def tiers(self, keys: Iterable[tuple[str, str, str]]) -> list[str]:
+        return [self.tier(*key) for key in keys]
+
+
+def load_priority_index(path: Path = RULES_PATH) -> PriorityIndex:
+    with path.open(encoding="utf-8") as handle:
+        return PriorityIndex.from_mapping(json.load(handle)["priority"])
+
+
+PRIORITY_INDEX = load_priority_index()
+
+
+def classify_priority(row: InventoryRow, workflow_id: str, index: PriorityIndex = PRIORITY_INDEX) -> str:
+    return index.tier(workflow_id, row.object, row.member_name)
 
 
 def blind_vi_purpose(workflow_id: str) -> str:
@@ -1144,68 +1956,348 @@ def blind_vi_purpose(workflow_id: str) -> str:
     return purposes[workflow_id]
 
 
-def enrich_master_rows(rows: list[dict[str, str]]) -> list[dict[str, str]]:
-    enriched: list[dict[str, str]] = []
-    for row in rows:
-        workflow_id = classify_workflow(row)
-        workflow = WORKFLOW_BY_ID[workflow_id]
-        enriched_row = dict(row)
-        enriched_row["workflow_id"] = workflow_id
-        enriched_row["workflow_title"] = workflow.title
-        enriched_row["workflow_order"] = str(workflow.order)
-        enriched_row["palette_lane"] = workflow.lane
-        enriched_row["accessible_label"] = readable_label(row)
-        enriched_row["context_label"] = short_context(row)
-        enriched_row["priority_tier"] = classify_priority(row, workflow_id)
-        enriched_row["blind_vi_purpose"] = blind_vi_purpose(workflow_id)
-        enriched.append(enriched_row)
-
-    enriched.sort(
-        key=lambda row: (
-            int(row["workflow_order"]),
-            PRIORITY_ORDER[row["priority_tier"]],
-            OBJECT_ORDER.get(row["object"], 99),
-            MEMBER_TYPE_ORDER.get(row["member_type"], 9),
-            row["accessible_label"].lower(),
-            row["member_name"].lower(),
-        )
+def enrich_row(row: InventoryRow) -> InventoryRow:
+    workflow_id = classify_workflow(row)
+    workflow = WORKFLOW_BY_ID[workflow_id]
+    return row._replace(
+        workflow_id=workflow.id,
+        workflow_title=workflow.title,
+        workflow_order=workflow.order,
+        palette_lane=workflow.lane,
+        priority_tier=classify_priority(row, workflow_id),
+        accessible_label=readable_label(row),
+        context_label=short_context(row),
+        blind_vi_purpose=blind_vi_purpose(workflow_id),
+    )
+
+
+def enriched_sort_key(row: InventoryRow) -> tuple:
+    return (
+        row.workflow_order,
+        PRIORITY_ORDER[row.priority_tier],
+        OBJECT_ORDER.get(row.object, 99),
+        MEMBER_TYPE_ORDER.get(row.member_type, 9),
+        row.accessible_label.lower(),
+        row.member_name.lower(),
     )
+
+
+def enrich_master_rows(rows: Iterable[InventoryRow]) -> list[InventoryRow]:
+    enriched = [enrich_row(row) for row in rows]
+    enriched.sort(key=enriched_sort_key)
     return enriched
 
 
-def load_csv(path: Path) -> list[dict[str, str]]:
+def iter_enriched(rows: Iterable[InventoryRow]) -> Iterator[InventoryRow]:
+    for row in rows:
+        yield enrich_row(row)
+
+
+def external_sort(
+    rows: Iterable[InventoryRow],
+    key: Callable[[InventoryRow], tuple],
+    spill_dir: Path,
+    *,
+    chunk_rows: int = DEFAULT_SORT_CHUNK_ROWS,
+) -> Iterator[InventoryRow]:
+    runs: list[Path] = []
+    chunk: list[InventoryRow] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            runs.append(spill_run(sorted(chunk, key=key), spill_dir / f"run-{len(runs):05d}.pickle"))
+            chunk = []
+    chunk.sort(key=key)
+    if not runs:
+        yield from chunk
+        return
+    if chunk:
+        runs.append(spill_run(chunk, spill_dir / f"run-{len(runs):05d}.pickle"))
+    yield from heapq.merge(*(read_run(run) for run in runs), key=key)
+
+
+def spill_run(rows: list[InventoryRow], path: Path) -> Path:
+    with path.open("wb") as handle:
+        pickler = pickle.Pickler(handle, protocol=pickle.HIGHEST_PROTOCOL)
+        for row in rows:
+            pickler.dump(tuple(row))
+    return path
+
+
+def read_run(path: Path) -> Iterator[InventoryRow]:
+    with path.open("rb") as handle:
+        unpickler = pickle.Unpickler(handle)
+        while True:
+            try:
+                yield InventoryRow._make(unpickler.load())
+            except EOFError:
+                return
+
+
+def stream_enriched_csv(
+    master_csv: Path,
+    output_csv: Path,
+    *,
+    chunk_rows: int = DEFAULT_SORT_CHUNK_ROWS,
+) -> Counter[str]:
+    counts: Counter[str] = Counter()
+
+    def counted(rows: Iterable[InventoryRow]) -> Iterator[InventoryRow]:
+        for row in rows:
+            counts[row.workflow_title] += 1
+            yield row
+
+    output_csv.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="inventory-sort-", dir=output_csv.parent) as spill_dir:
+        enriched = iter_enriched(iter_inventory(master_csv))
+        ordered = external_sort(enriched, enriched_sort_key, Path(spill_dir), chunk_rows=chunk_rows)
+        write_csv(output_csv, counted(ordered), ENRICHED_FIELDNAMES)
+    return counts
+
+
+class Inventory:
+    def __init__(self, rows: Iterable[InventoryRow]) -> None:
+        self.rows = tuple(rows)
+        by_workflow: dict[str, list[InventoryRow]] = defaultdict(list)
+        by_object: dict[str, list[InventoryRow]] = defaultdict(list)
+        by_layer: dict[str, list[InventoryRow]] = defaultdict(list)
+        by_tier: dict[str, list[InventoryRow]] = defaultdict(list)
+        by_workflow_tier: dict[tuple[str, str], list[InventoryRow]] = defaultdict(list)
+        for row in self.rows:
+            by_workflow[row.workflow_id].append(row)
+            by_object[row.object].append(row)
+            by_layer[row.layer].append(row)
+            by_tier[row.priority_tier].append(row)
+            by_workflow_tier[row.workflow_id, row.priority_tier].append(row)
+        self.by_workflow = freeze_groups(by_workflow)
+        self.by_object = freeze_groups(by_object)
+        self.by_layer = freeze_groups(by_layer)
+        self.by_tier = freeze_groups(by_tier)
+        self.by_workflow_tier = freeze_groups(by_workflow_tier)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[InventoryRow]:
+        return iter(self.rows)
+
+    def workflow(self, workflow_id: str) -> tuple[InventoryRow, ...]:
+        return self.by_workflow.get(workflow_id, ())
+
+    def object(self, object_name: str) -> tuple[InventoryRow, ...]:
+        return self.by_object.get(object_name, ())
+
+    def layer(self, layer: str) -> tuple[InventoryRow, ...]:
+        return self.by_layer.get(layer, ())
+
+    def tier(self, priority_tier: str) -> tuple[InventoryRow, ...]:
+        return self.by_tier.get(priority_tier, ())
+
+    def workflow_tier(self, workflow_id: str, priority_tier: str) -> tuple[InventoryRow, ...]:
+        return self.by_workflow_tier.get((workflow_id, priority_tier), ())
+
+
+def freeze_groups(groups: Mapping) -> MappingProxyType:
+    return MappingProxyType({key: tuple(rows) for key, rows in groups.items()})
+
+
+def iter_inventory(path: Path) -> Iterator[InventoryRow]:
     with path.open(newline="", encoding="utf-8") as handle:
-        return list(csv.DictReader(handle))
+        for record in csv.DictReader(handle):
+            yield InventoryRow.from_record(record)
+
 
+def load_inventory(path: Path) -> list[InventoryRow]:
+    return list(iter_inventory(path))
 
-def write_csv(path: Path, rows: list[dict[str, str]], fieldnames: list[str]) -> None:
+
+def load_beta_terms(path: Path) -> list[BetaTermRow]:
+    with path.open(newline="", encoding="utf-8") as handle:
+        return [BetaTermRow.from_record(record) for record in csv.DictReader(handle)]
+
+
+def write_csv(path: Path, rows: Iterable[tuple], fieldnames: list[str]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+        writer = csv.writer(handle)
+        writer.writerow(fieldnames)
+        writer.writerows([getattr(row, name) for name in fieldnames] for row in rows)
+
+
+def build_date(value: date | None = None) -> date:
+    if value is not None:
+        return value
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), tz=timezone.utc).date()
+    return date.today()
 
 
-def generated_on_label() -> str:
-    today = date.today()
+def generated_on_label(today: date | None = None) -> str:
+    today = build_date(today)
     return f"Generated {today:%B} {today.day}, {today.year}"
 
 
-def workflow_summary_rows(enriched_rows: list[dict[str, str]]) -> list[list[str]]:
-    grouped: dict[str, list[dict[str, str]]] = defaultdict(list)
-    for row in enriched_rows:
-        grouped[row["workflow_id"]].append(row)
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_fingerprint(inputs: Iterable[Path], params: dict[str, object]) -> str:
+    digest = hashlib.sha256()
+    digest.update(json.dumps({"version": BUILD_MANIFEST_VERSION, "params": params}, sort_keys=True).encode("utf-8"))
+    for path in inputs:
+        digest.update(f"\n{path.name}:{file_digest(path)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class BuildProfile:
+    def __init__(self, document: str, *, trace_memory: bool = False) -> None:
+        self.document = document
+        self.trace_memory = trace_memory
+        self.stages: dict[str, dict[str, float]] = {}
+        self.counters: Counter[str] = Counter()
+        self.page_streams: list[int] = []
+        self.width_cache = text_width_units.cache_info()
+        self.started = time.perf_counter()
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            recorded = self.stages.setdefault(name, {"seconds": 0.0})
+            recorded["seconds"] = round(recorded["seconds"] + seconds, 6)
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                recorded["peak_mb"] = max(recorded.get("peak_mb", 0.0), round(peak / 1_000_000, 3))
+
+    def metrics(self) -> dict:
+        streams = self.page_streams
+        width_cache = text_width_units.cache_info()
+        return {
+            "version": BUILD_PROFILE_VERSION,
+            "document": self.document,
+            "memory_traced": self.trace_memory,
+            "total_seconds": round(time.perf_counter() - self.started, 6),
+            "stages": self.stages,
+            "counters": dict(sorted(self.counters.items())),
+            "width_cache": {
+                "hits": width_cache.hits - self.width_cache.hits,
+                "misses": width_cache.misses - self.width_cache.misses,
+            },
+            "page_streams": {
+                "count": len(streams),
+                "total_bytes": sum(streams),
+                "min_bytes": min(streams, default=0),
+                "max_bytes": max(streams, default=0),
+                "mean_bytes": round(sum(streams) / len(streams), 1) if streams else 0,
+            },
+        }
 
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.metrics(), indent=2) + "\n", encoding="utf-8")
+
+
+ACTIVE_PROFILE: BuildProfile | None = None
+
+
+@contextmanager
+def profiling(profile: BuildProfile | None, stats_path: Path | None = None) -> Iterator[BuildProfile | None]:
+    global ACTIVE_PROFILE
+    if profile is None:
+        yield None
+        return
+    profiler = cProfile.Profile() if stats_path is not None else None
+    # tracemalloc slows allocation-heavy stages severalfold, so it only runs when asked for.
+    started_tracing = profile.trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    ACTIVE_PROFILE = profile
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield profile
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            stats_path.parent.mkdir(parents=True, exist_ok=True)
+            profiler.dump_stats(stats_path)
+        ACTIVE_PROFILE = None
+        if started_tracing:
+            tracemalloc.stop()
+
+
+@contextmanager
+def profiled_stage(name: str) -> Iterator[None]:
+    if ACTIVE_PROFILE is None:
+        yield
+        return
+    with ACTIVE_PROFILE.stage(name):
+        yield
+
+
+def print_profile(profile: BuildProfile, path: Path) -> None:
+    metrics = profile.metrics()
+    print(f"Profile: {path}")
+    if metrics["memory_traced"]:
+        print("  stage timings were taken under tracemalloc and run slower than a normal build")
+    for name, stage in metrics["stages"].items():
+        peak = f"  peak {stage['peak_mb']:.1f} MB" if "peak_mb" in stage else ""
+        print(f"  {name:<20} {stage['seconds']:>9.4f}s{peak}")
+    for name, value in metrics["counters"].items():
+        print(f"  {name}: {value}")
+    print(f"  page stream bytes: {metrics['page_streams']['total_bytes']} over {metrics['page_streams']['count']} pages")
+
+
+class BuildManifest:
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+
+    def is_current(self) -> bool:
+        try:
+            recorded = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        if recorded.get("fingerprint") != self.fingerprint:
+            return False
+        for output, digest in recorded.get("outputs", {}).items():
+            path = Path(output)
+            if not path.is_file() or file_digest(path) != digest:
+                return False
+        return bool(recorded.get("outputs"))
+
+    def record(self, outputs: Iterable[Path]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "fingerprint": self.fingerprint,
+            "outputs": {str(path): file_digest(path) for path in outputs},
+        }
+        self.path.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def workflow_summary_rows(inventory: Inventory) -> list[list[str]]:
     rows: list[list[str]] = []
     for workflow in WORKFLOWS:
-        members = grouped[workflow.id]
-        core_labels = [row["accessible_label"].lower() for row in members if row["priority_tier"] == "core"][:4]
+        core_labels = [row.accessible_label.lower() for row in inventory.workflow_tier(workflow.id, "core")[:4]]
         rows.append(
             [
                 workflow.lane,
                 workflow.title,
                 workflow.question,
-                str(len(members)),
+                str(len(inventory.workflow(workflow.id))),
                 ", ".join(core_labels),
             ]
         )
@@ -1221,35 +2313,46 @@ def modifier_rows() -> list[list[str]]:
     ]
 
 
-def workflow_section_rows(enriched_rows: list[dict[str, str]], workflow_id: str) -> list[dict[str, str]]:
-    return [row for row in enriched_rows if row["workflow_id"] == workflow_id]
-
-
-def current_inventory_rows(rows: list[dict[str, str]]) -> list[dict[str, str]]:
+def current_inventory_rows(rows: list[BetaTermRow]) -> list[BetaTermRow]:
     ordered = list(rows)
     ordered.sort(
         key=lambda row: (
-            list(CURRENT_WORKFLOW_NAMES).index(row["workflow_group"])
-            if row["workflow_group"] in CURRENT_WORKFLOW_NAMES
+            list(CURRENT_WORKFLOW_NAMES).index(row.workflow_group)
+            if row.workflow_group in CURRENT_WORKFLOW_NAMES
             else 999,
-            row["term"].lower(),
+            row.term.lower(),
         )
     )
     return ordered
 
 
-def build_report(
-    enriched_rows: list[dict[str, str]],
-    current_rows: list[dict[str, str]],
-    output_pdf: Path,
-    preview_dir: Path,
-) -> int:
-    document = LayoutDocument(
-        "Blind and VI-First Accessibility Strings",
-        "Session View workflow report",
-    )
-    document.title_page(generated_on_label())
+def appendix_a_rows(current_rows: list[BetaTermRow]) -> list[list[str]]:
+    return [
+        [
+            CURRENT_WORKFLOW_NAMES.get(row.workflow_group, row.workflow_group),
+            row.term,
+            row.current_surface,
+            row.notes,
+        ]
+        for row in current_rows
+    ]
+
 
+def appendix_b_rows(inventory: Inventory) -> list[list[str]]:
+    return [
+        [
+            row.workflow_title,
+            row.priority_tier.title(),
+            row.palette_lane,
+            row.member_name,
+            row.accessible_label,
+            row.context_label,
+        ]
+        for row in inventory
+    ]
+
+
+def palette_section(document: LayoutDocument, modifiers: list[list[str]]) -> None:
     document.section_title("Palette Model")
     document.paragraph(
         "The report assumes a single palette entry point such as the backquote key. Once engaged, the "
@@ -1258,13 +2361,15 @@ def build_report(
     )
     document.table(
         ["Modifier pattern", "Recommended behavior"],
-        modifier_rows(),
+        modifiers,
         [126.0, CONTENT_WIDTH - 126.0],
         body_size=8.7,
         body_leading=11.3,
         header_size=8.8,
     )
 
+
+def workflow_lanes_section(document: LayoutDocument, summary_rows: list[list[str]]) -> None:
     document.section_title("Workflow Lanes")
     document.paragraph(
         "The eight lanes below are ordered by practical music-making flow for blind and VI users: "
@@ -1272,29 +2377,30 @@ def build_report(
     )
     document.table(
         ["Lane", "Workflow", "Primary question", "Items", "Core examples"],
-        workflow_summary_rows(enriched_rows),
+        summary_rows,
         [44.0, 118.0, 176.0, 42.0, CONTENT_WIDTH - 44.0 - 118.0 - 176.0 - 42.0],
         body_size=8.0,
         body_leading=10.4,
         header_size=8.5,
     )
 
-    for workflow in WORKFLOWS:
-        rows = workflow_section_rows(enriched_rows, workflow.id)
-        sample_core = [row["accessible_label"] for row in rows if row["priority_tier"] == "core"][:6]
-        document.section_title(workflow.title)
-        document.paragraph(workflow.rationale)
-        document.bullets(
-            [
-                f"Primary question: {workflow.question}",
-                f"Default lane: {workflow.lane}",
-                f"Blind / VI value: {workflow.blind_value}",
-                "Modifier rule: Shift expands, Control speaks raw values, Option enables monitoring within the same lane.",
-                f"High-value strings: {', '.join(sample_core).lower()}",
-            ],
-            bullet_indent=16,
-        )
 
+def workflow_section(document: LayoutDocument, workflow: Workflow, sample_core: list[str]) -> None:
+    document.section_title(workflow.title)
+    document.paragraph(workflow.rationale)
+    document.bullets(
+        [
+            f"Primary question: {workflow.question}",
+            f"Default lane: {workflow.lane}",
+            f"Blind / VI value: {workflow.blind_value}",
+            "Modifier rule: Shift expands, Control speaks raw values, Option enables monitoring within the same lane.",
+            f"High-value strings: {', '.join(sample_core).lower()}",
+        ],
+        bullet_indent=16,
+    )
+
+
+def critical_findings_section(document: LayoutDocument) -> None:
     document.section_title("Critical Findings")
     document.bullets(
         [
@@ -1306,48 +2412,32 @@ def build_report(
         bullet_indent=14,
     )
 
+
+def appendix_a_section(document: LayoutDocument, appendix_rows: list[list[str]]) -> None:
     document.section_title("Appendix A: Current Beta Exposed Terms")
     document.paragraph(
         "These rows capture the present beta surface: spoken tokens, state fields, and device-trigger terms "
         "already exposed by Clip Announcer."
     )
-    appendix_a_rows = [
-        [
-            CURRENT_WORKFLOW_NAMES.get(row["workflow_group"], row["workflow_group"]),
-            row["term"],
-            row["current_surface"],
-            row["notes"],
-        ]
-        for row in current_rows
-    ]
     document.table(
         ["Workflow group", "Term", "Current surface", "Notes"],
-        appendix_a_rows,
+        appendix_rows,
         [112.0, 110.0, 122.0, CONTENT_WIDTH - 112.0 - 110.0 - 122.0],
         body_size=7.9,
         body_leading=10.1,
         header_size=8.5,
     )
 
+
+def appendix_b_section(document: LayoutDocument, appendix_rows: list[list[str]]) -> None:
     document.section_title("Appendix B: Exhaustive Workflow-Sorted Accessibility Strings")
     document.paragraph(
         "Each row below is a readable Session View element. The report assigns it to one primary workflow lane, "
         "gives it a proposed spoken label, and sorts it by priority tier so the list stays usable."
     )
-    appendix_b_rows = [
-        [
-            row["workflow_title"],
-            row["priority_tier"].title(),
-            row["palette_lane"],
-            row["member_name"],
-            row["accessible_label"],
-            row["context_label"],
-        ]
-        for row in enriched_rows
-    ]
     document.table(
         ["Workflow", "Tier", "Lane", "Source token", "Spoken label", "Context"],
-        appendix_b_rows,
+        appendix_rows,
         [98.0, 38.0, 38.0, 78.0, 110.0, CONTENT_WIDTH - 98.0 - 38.0 - 38.0 - 78.0 - 110.0],
         body_font="F3",
         body_size=7.1,
@@ -1355,64 +2445,354 @@ def build_report(
         header_size=8.0,
     )
 
-    document.add_header_footer()
-    writer = PDFWriter(document.pages)
-    writer.write(output_pdf)
 
-    preview_dir.mkdir(parents=True, exist_ok=True)
-    for index, page in enumerate(document.pages, start=1):
-        page_writer = PDFWriter([page])
-        page_writer.write(preview_dir / f"page-{index:03d}.pdf")
+def layout_report(
+    inventory: Inventory,
+    current_rows: list[BetaTermRow],
+    *,
+    generated_on: str | None = None,
+    measure_only: bool = False,
+    section_cache: SectionCache | None = None,
+) -> LayoutDocument:
+    document = LayoutDocument(
+        "Blind and VI-First Accessibility Strings",
+        "Session View workflow report",
+        measure_only=measure_only,
+        section_cache=section_cache,
+    )
+    document.cached_section(LayoutDocument.title_page, generated_on or generated_on_label())
+    document.cached_section(palette_section, modifier_rows())
+    document.cached_section(workflow_lanes_section, workflow_summary_rows(inventory))
+
+    for workflow in WORKFLOWS:
+        sample_core = [row.accessible_label for row in inventory.workflow_tier(workflow.id, "core")[:6]]
+        document.cached_section(workflow_section, workflow, sample_core)
+
+    document.cached_section(critical_findings_section)
+
+    document.cached_section(appendix_a_section, appendix_a_rows(current_rows))
+
+    document.cached_section(appendix_b_section, appendix_b_rows(inventory))
+    return document
+
+
+def build_report(
+    inventory: Inventory,
+    current_rows: list[BetaTermRow],
+    output_pdf: Path,
+    preview_dir: Path,
+    *,
+    generated_on: str | None = None,
+    compress_level: int = DEFAULT_COMPRESS_LEVEL,
+    jobs: int = 1,
+    section_cache: SectionCache | None = None,
+    object_streams: bool = False,
+) -> int:
+    with profiled_stage("layout"):
+        document = layout_report(
+            inventory,
+            current_rows,
+            generated_on=generated_on,
+            section_cache=section_cache,
+        )
+        if section_cache is not None:
+            section_cache.save()
+    with profiled_stage("add_header_footer"):
+        document.add_header_footer()
+    with profiled_stage("pdf_write"):
+        writer = PDFWriter(
+            document.pages,
+            forms=document.forms,
+            compress_level=compress_level,
+            object_streams=object_streams,
+        )
+        writer.write(output_pdf)
+    with profiled_stage("previews"):
+        split_pdf_pages(output_pdf, preview_dir, jobs=jobs)
     return len(document.pages)
 
 
-def main() -> None:
-    repo_root = Path(__file__).resolve().parents[1]
-    master_csv = repo_root / "SESSION_VIEW_READABLE_UI_MASTER_LIST.csv"
-    current_csv = repo_root / "SESSION_UI_TERMS_INVENTORY.csv"
-
-    output_pdf = repo_root / "output" / "pdf" / "session_view_accessibility_workflow_report.pdf"
-    output_master_csv = repo_root / "output" / "csv" / "session_view_accessibility_strings_by_workflow.csv"
-    output_current_csv = repo_root / "output" / "csv" / "clip_announcer_current_beta_terms_by_workflow.csv"
-    preview_dir = repo_root / "tmp" / "pdfs" / "session_view_accessibility_workflow_report_pages"
-
-    master_rows = load_csv(master_csv)
-    current_rows = current_inventory_rows(load_csv(current_csv))
-    enriched_rows = enrich_master_rows(master_rows)
-
-    write_csv(
-        output_master_csv,
-        enriched_rows,
-        [
-            "workflow_order",
-            "workflow_id",
-            "workflow_title",
-            "palette_lane",
-            "priority_tier",
-            "layer",
-            "object",
-            "canonical_path",
-            "member_type",
-            "member_name",
-            "accessible_label",
-            "context_label",
-            "blind_vi_purpose",
-        ],
-    )
-    write_csv(
-        output_current_csv,
-        current_rows,
-        ["workflow_group", "term", "kind", "current_surface", "notes"],
+def write_preview_chunk(source_pdf: Path, indexes: list[int], preview_dir: Path) -> list[Path]:
+    return PDFPageSplitter(source_pdf).write_pages(indexes, preview_dir)
+
+
+def print_measurement(measurement: LayoutMeasurement) -> None:
+    print(f"Pages: {measurement.page_count}")
+    for page, extent in enumerate(measurement.page_extents, start=1):
+        print(f"  page {page}: content ends at y={pdf_num(extent)} of {pdf_num(CONTENT_BOTTOM)}")
+    for section in measurement.sections:
+        print(f"  p{section.page} y={pdf_num(section.y)}: {section.title}")
+
+
+def split_pdf_pages(source_pdf: Path, preview_dir: Path, *, jobs: int = 1) -> list[Path]:
+    return PDFPageSplitter(source_pdf).split(preview_dir, jobs=jobs)
+
+
+@dataclass(frozen=True)
+class ReportPaths:
+    master_csv: Path
+    current_csv: Path
+    output_pdf: Path
+    output_master_csv: Path
+    output_current_csv: Path
+    preview_dir: Path
+    manifest: Path
+    section_cache: Path
+    profile: Path
+
+    @classmethod
+    def for_root(cls, repo_root: Path = REPO_ROOT, *, master_csv: Path | None = None) -> ReportPaths:
+        return cls(
+            master_csv=master_csv or repo_root / "SESSION_VIEW_READABLE_UI_MASTER_LIST.csv",
+            current_csv=repo_root / "SESSION_UI_TERMS_INVENTORY.csv",
+            output_pdf=repo_root / "output" / "pdf" / "session_view_accessibility_workflow_report.pdf",
+            output_master_csv=repo_root / "output" / "csv" / "session_view_accessibility_strings_by_workflow.csv",
+            output_current_csv=repo_root / "output" / "csv" / "clip_announcer_current_beta_terms_by_workflow.csv",
+            preview_dir=repo_root / "tmp" / "pdfs" / "session_view_accessibility_workflow_report_pages",
+            manifest=repo_root / "tmp" / "build-manifests" / "session_view_accessibility_workflow_report.json",
+            section_cache=repo_root / "tmp" / "build-cache" / "session_view_accessibility_workflow_report.sections",
+            profile=repo_root / "tmp" / "build-profiles" / "session_view_accessibility_workflow_report.json",
+        )
+
+    def outputs(self, page_count: int) -> list[Path]:
+        return [
+            self.output_master_csv,
+            self.output_current_csv,
+            self.output_pdf,
+            *(self.preview_dir / f"page-{index:03d}.pdf" for index in range(1, page_count + 1)),
+        ]
+
+
+def report_manifest(
+    paths: ReportPaths,
+    *,
+    compress_level: int,
+    generated_on: str,
+    object_streams: bool = False,
+) -> BuildManifest:
+    return BuildManifest(
+        paths.manifest,
+        build_fingerprint(
+            [paths.master_csv, paths.current_csv, REPORT_SOURCE, RULES_PATH],
+            {"compress_level": compress_level, "generated_on": generated_on, "object_streams": object_streams},
+        ),
     )
 
-    page_count = build_report(enriched_rows, current_rows, output_pdf, preview_dir)
-    counts = Counter(row["workflow_title"] for row in enriched_rows)
-    print(f"PDF: {output_pdf}")
+
+def report_section_cache(path: Path) -> SectionCache:
+    return SectionCache(path, f"{SECTION_CACHE_VERSION}:{file_digest(REPORT_SOURCE)}:{file_digest(RULES_PATH)}")
+
+
+def write_report_csvs(paths: ReportPaths, inventory: Inventory, current_rows: list[BetaTermRow]) -> None:
+    write_csv(paths.output_master_csv, inventory, ENRICHED_FIELDNAMES)
+    write_csv(paths.output_current_csv, current_rows, BETA_TERM_FIELDNAMES)
+
+
+def print_report_summary(
+    paths: ReportPaths,
+    inventory: Inventory,
+    page_count: int,
+    section_cache: SectionCache | None,
+) -> None:
+    print(f"PDF: {paths.output_pdf}")
     print(f"Pages: {page_count}")
-    print(f"Workflow CSV: {output_master_csv}")
-    print(f"Current beta CSV: {output_current_csv}")
+    if section_cache is not None:
+        print(f"Sections: {section_cache.hits} reused, {section_cache.misses} laid out")
+    print(f"Workflow CSV: {paths.output_master_csv}")
+    print(f"Current beta CSV: {paths.output_current_csv}")
     for workflow in WORKFLOWS:
-        print(f"{workflow.title}: {counts[workflow.title]} items")
+        print(f"{workflow.title}: {len(inventory.workflow(workflow.id))} items")
+
+
+def compress_level_arg(value: str) -> int:
+    level = int(value)
+    if not 0 <= level <= 9:
+        raise argparse.ArgumentTypeError("compression level must be between 0 and 9")
+    return level
+
+
+def jobs_arg(value: str) -> int:
+    jobs = int(value)
+    if jobs < 1:
+        raise argparse.ArgumentTypeError("jobs must be at least 1")
+    return jobs
+
+
+def sort_chunk_rows_arg(value: str) -> int:
+    rows = int(value)
+    if rows < 1:
+        raise argparse.ArgumentTypeError("sort chunk must hold at least 1 row")
+    return rows
+
+
+def date_arg(value: str) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got {value!r}") from error
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the workflow-sorted accessibility strings report.")
+    parser.add_argument(
+        "--compress-level",
+        type=compress_level_arg,
+        default=DEFAULT_COMPRESS_LEVEL,
+        help=(
+            "zlib level for PDF content streams; 0 writes them uncompressed, though not byte-identical to the layout "
+            f"of builds from before compression was added (default: {DEFAULT_COMPRESS_LEVEL})"
+        ),
+    )
+    parser.add_argument(
+        "--object-streams",
+        action="store_true",
+        help="write PDF 1.5 with compressed object streams and an xref stream instead of a classic xref table",
+    )
+    parser.add_argument(
+        "--previews-only",
+        action="store_true",
+        help="split the existing report PDF into per-page previews without re-running layout",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=jobs_arg,
+        default=1,
+        help="worker processes for per-page preview emission (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="run pagination only and print page and section positions without writing any output",
+    )
+    parser.add_argument(
+        "--date",
+        type=date_arg,
+        help="fixed YYYY-MM-DD for the generated-on label (default: SOURCE_DATE_EPOCH, then today)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild even when the build manifest says the outputs are current",
+    )
+    parser.add_argument(
+        "--no-section-cache",
+        action="store_true",
+        help="lay out every section from scratch instead of reusing cached section fragments",
+    )
+    parser.add_argument(
+        "--master-csv",
+        type=Path,
+        help="inventory CSV to enrich (default: SESSION_VIEW_READABLE_UI_MASTER_LIST.csv at the repo root)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="stream the inventory into the workflow-sorted CSV with a bounded-memory sort and skip the PDF",
+    )
+    parser.add_argument(
+        "--sort-chunk-rows",
+        type=sort_chunk_rows_arg,
+        default=DEFAULT_SORT_CHUNK_ROWS,
+        help=f"rows held in memory per sorted run in --stream mode (default: {DEFAULT_SORT_CHUNK_ROWS})",
+    )
+    add_profile_args(parser)
+    return parser.parse_args()
+
+
+def add_profile_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help=(
+            "rebuild regardless of the manifest, lay out every section without the section cache, "
+            "and write per-stage timings and counters as JSON"
+        ),
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="also record per-stage peak memory with tracemalloc, which slows the timed stages (implies --profile)",
+    )
+    parser.add_argument(
+        "--pstats",
+        action="store_true",
+        help="also dump cProfile statistics next to the JSON metrics (implies --profile)",
+    )
+
+
+def main() -> None:
+    args = parse_args()
+    paths = ReportPaths.for_root(master_csv=args.master_csv)
+
+    if args.previews_only:
+        try:
+            previews = split_pdf_pages(paths.output_pdf, paths.preview_dir, jobs=args.jobs)
+        except (OSError, ValueError) as error:
+            print(f"[FAIL] cannot split {paths.output_pdf}: {error}")
+            sys.exit(1)
+        print(f"Previews: {paths.preview_dir}")
+        print(f"Pages: {len(previews)}")
+        return
+
+    if args.stream:
+        counts = stream_enriched_csv(paths.master_csv, paths.output_master_csv, chunk_rows=args.sort_chunk_rows)
+        print(f"Workflow CSV: {paths.output_master_csv}")
+        print(f"Rows: {sum(counts.values())}")
+        for workflow in WORKFLOWS:
+            print(f"{workflow.title}: {counts[workflow.title]} items")
+        return
+
+    args.profile = args.profile or args.pstats or args.trace_memory
+    profile = BuildProfile(paths.output_pdf.stem, trace_memory=args.trace_memory) if args.profile else None
+    with profiling(profile, paths.profile.with_suffix(".pstats") if args.pstats else None):
+        run_build(args, paths)
+    if profile is not None:
+        profile.write(paths.profile)
+        print_profile(profile, paths.profile)
+
+
+def run_build(args: argparse.Namespace, paths: ReportPaths) -> None:
+    generated_on = generated_on_label(args.date)
+    manifest = report_manifest(
+        paths,
+        compress_level=args.compress_level,
+        generated_on=generated_on,
+        object_streams=args.object_streams,
+    )
+    if not args.dry_run and not args.force and not args.profile and manifest.is_current():
+        print(f"[OK] up to date: {paths.output_pdf}")
+        return
+
+    with profiled_stage("load_csv"):
+        master_rows = load_inventory(paths.master_csv)
+        current_rows = current_inventory_rows(load_beta_terms(paths.current_csv))
+    with profiled_stage("enrich_master_rows"):
+        inventory = Inventory(enrich_master_rows(master_rows))
+
+    if args.dry_run:
+        with profiled_stage("layout"):
+            document = layout_report(inventory, current_rows, measure_only=True)
+        print_measurement(document.measurement())
+        return
+
+    with profiled_stage("write_csv"):
+        write_report_csvs(paths, inventory, current_rows)
+    # A profiled build lays out every section, so the hot-path counters and layout timing are not a cache replay.
+    use_cache = not args.no_section_cache and not args.profile
+    section_cache = report_section_cache(paths.section_cache) if use_cache else None
+    page_count = build_report(
+        inventory,
+        current_rows,
+        paths.output_pdf,
+        paths.preview_dir,
+        generated_on=generated_on,
+        compress_level=args.compress_level,
+        jobs=args.jobs,
+        section_cache=section_cache,
+        object_streams=args.object_streams,
+    )
+    manifest.record(paths.outputs(page_count))
+    print_report_summary(paths, inventory, page_count, section_cache)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from build_accessibility_workflow_report import (
+    DEFAULT_COMPRESS_LEVEL,
+    Inventory,
+    ReportPaths,
+    build_report,
+    compress_level_arg,
+    current_inventory_rows,
+    date_arg,
+    enrich_master_rows,
+    generated_on_label,
+    jobs_arg,
+    load_beta_terms,
+    load_inventory,
+    print_report_summary,
+    report_manifest,
+    report_section_cache,
+    write_report_csvs,
+)
+from build_session_view_ui_reference_pdf import (
+    REFERENCE_MANIFEST,
+    REFERENCE_PDF,
+    reference_manifest,
+    write_reference,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Build the workflow report, CSV exports, previews and community reference in one process."
+    )
+    parser.add_argument(
+        "--compress-level",
+        type=compress_level_arg,
+        default=DEFAULT_COMPRESS_LEVEL,
+        help=(
+            "zlib level for PDF content streams; 0 writes them uncompressed, though not byte-identical to the layout "
+            f"of builds from before compression was added (default: {DEFAULT_COMPRESS_LEVEL})"
+        ),
+    )
+    parser.add_argument(
+        "--object-streams",
+        action="store_true",
+        help="write PDF 1.5 with compressed object streams and an xref stream instead of a classic xref table",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=jobs_arg,
+        default=1,
+        help="worker processes for per-page preview emission (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--documents",
+        type=jobs_arg,
+        default=1,
+        help="documents to lay out and write concurrently (default: 1, one after another)",
+    )
+    parser.add_argument(
+        "--date",
+        type=date_arg,
+        help="fixed YYYY-MM-DD for the generated-on label (default: SOURCE_DATE_EPOCH, then today)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild every document even when its build manifest says the outputs are current",
+    )
+    parser.add_argument(
+        "--no-section-cache",
+        action="store_true",
+        help="lay out every report section from scratch instead of reusing cached section fragments",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    paths = ReportPaths.for_root()
+    generated_on = generated_on_label(args.date)
+
+    report = report_manifest(
+        paths,
+        compress_level=args.compress_level,
+        generated_on=generated_on,
+        object_streams=args.object_streams,
+    )
+    reference = reference_manifest(
+        paths.master_csv,
+        REFERENCE_MANIFEST,
+        compress_level=args.compress_level,
+        generated_on=generated_on,
+        object_streams=args.object_streams,
+    )
+    build_report_pdf = args.force or not report.is_current()
+    build_reference_pdf = args.force or not reference.is_current()
+    if not build_report_pdf:
+        print(f"[OK] up to date: {paths.output_pdf}")
+    if not build_reference_pdf:
+        print(f"[OK] up to date: {REFERENCE_PDF}")
+    if not build_report_pdf and not build_reference_pdf:
+        return
+
+    master_rows = load_inventory(paths.master_csv)
+    tasks: dict[str, Callable[[], int]] = {}
+
+    if build_report_pdf:
+        inventory = Inventory(enrich_master_rows(master_rows))
+        current_rows = current_inventory_rows(load_beta_terms(paths.current_csv))
+        write_report_csvs(paths, inventory, current_rows)
+        section_cache = None if args.no_section_cache else report_section_cache(paths.section_cache)
+        tasks["report"] = lambda: build_report(
+            inventory,
+            current_rows,
+            paths.output_pdf,
+            paths.preview_dir,
+            generated_on=generated_on,
+            compress_level=args.compress_level,
+            jobs=args.jobs,
+            section_cache=section_cache,
+            object_streams=args.object_streams,
+        )
+
+    if build_reference_pdf:
+        tasks["reference"] = lambda: write_reference(
+            Inventory(master_rows),
+            REFERENCE_PDF,
+            generated_on=generated_on,
+            compress_level=args.compress_level,
+            object_streams=args.object_streams,
+        )
+
+    with ThreadPoolExecutor(max_workers=args.documents) as executor:
+        futures = {name: executor.submit(task) for name, task in tasks.items()}
+        page_counts = {name: future.result() for name, future in futures.items()}
+
+    if build_report_pdf:
+        report.record(paths.outputs(page_counts["report"]))
+        print_report_summary(paths, inventory, page_counts["report"], section_cache)
+    if build_reference_pdf:
+        reference.record([REFERENCE_PDF])
+        print(f"[OK] wrote {REFERENCE_PDF}")
+        print(f"[OK] pages: {page_counts['reference']}")
+
+
+if __name__ == "__main__":
+    main()
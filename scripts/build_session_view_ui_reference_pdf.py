@@ -1,30 +1,49 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-from collections import Counter, defaultdict
+import argparse
 from pathlib import Path
 
 from build_accessibility_workflow_report import (
     ACCENT,
     ACCENT_DARK,
     CONTENT_WIDTH,
+    DEFAULT_COMPRESS_LEVEL,
     INK,
     LEFT_MARGIN,
     MUTED,
     PAGE_WIDTH,
     PDFWriter,
+    REPO_ROOT,
+    REPORT_SOURCE,
     SOFT_FILL,
     WHITE,
+    BuildManifest,
+    BuildProfile,
+    Inventory,
+    InventoryRow,
     LayoutDocument,
     add_text,
+    add_profile_args,
     add_text_lines,
-    color_fill,
+    build_fingerprint,
+    compress_level_arg,
+    date_arg,
     generated_on_label,
-    load_csv,
-    rect_cmd,
+    load_inventory,
+    print_measurement,
+    print_profile,
+    profiled_stage,
+    profiling,
 )
 
 
+REFERENCE_SOURCE = Path(__file__).resolve()
+REFERENCE_PDF = REPO_ROOT / "community-reference" / "SESSION_VIEW_UI_DEVELOPER_REFERENCE.pdf"
+REFERENCE_MANIFEST = REPO_ROOT / "tmp" / "build-manifests" / "SESSION_VIEW_UI_DEVELOPER_REFERENCE.json"
+REFERENCE_PROFILE = REPO_ROOT / "tmp" / "build-profiles" / "SESSION_VIEW_UI_DEVELOPER_REFERENCE.json"
+MASTER_CSV = REPO_ROOT / "SESSION_VIEW_READABLE_UI_MASTER_LIST.csv"
+
 LAYER_TITLES = {
     "selection": "Selection Layer",
     "session_global": "Session Global Layer",
@@ -65,11 +84,11 @@ OBJECT_ORDER = [
 ]
 
 
-def title_page(document: LayoutDocument, total_entries: int) -> None:
+def title_page(document: LayoutDocument, total_entries: int, generated_on: str) -> None:
     page = document.page
-    page.add(f"{color_fill(WHITE)}{rect_cmd(0, 0, PAGE_WIDTH, 792)}")
-    page.add(f"{color_fill(SOFT_FILL)}{rect_cmd(0, 0, PAGE_WIDTH, 210)}")
-    page.add(f"{color_fill(ACCENT)}{rect_cmd(LEFT_MARGIN, 86, 8, 94)}")
+    page.fill_rect(WHITE, 0, 0, PAGE_WIDTH, 792)
+    page.fill_rect(SOFT_FILL, 0, 0, PAGE_WIDTH, 210)
+    page.fill_rect(ACCENT, LEFT_MARGIN, 86, 8, 94)
     add_text_lines(
         page,
         LEFT_MARGIN + 22,
@@ -96,7 +115,7 @@ def title_page(document: LayoutDocument, total_entries: int) -> None:
         page,
         LEFT_MARGIN + 22,
         170,
-        generated_on_label(),
+        generated_on,
         font="F1",
         size=10.5,
         color=ACCENT_DARK,
@@ -117,8 +136,7 @@ def title_page(document: LayoutDocument, total_entries: int) -> None:
     )
 
 
-def coverage_rows(rows: list[dict[str, str]]) -> list[list[str]]:
-    counts = Counter(row["layer"] for row in rows)
+def coverage_rows(inventory: Inventory) -> list[list[str]]:
     ordered_layers = [
         "selection",
         "session_global",
@@ -133,8 +151,8 @@ def coverage_rows(rows: list[dict[str, str]]) -> list[list[str]]:
     ]
     rows_out = []
     for layer in ordered_layers:
-        rows_out.append([LAYER_TITLES[layer], str(counts[layer])])
-    rows_out.append(["Total verified readable entries", str(sum(counts.values()))])
+        rows_out.append([LAYER_TITLES[layer], str(len(inventory.layer(layer)))])
+    rows_out.append(["Total verified readable entries", str(len(inventory))])
     return rows_out
 
 
@@ -168,20 +186,16 @@ def entry_point_rows() -> list[list[str]]:
     ]
 
 
-def object_summary_rows(rows: list[dict[str, str]]) -> list[list[str]]:
-    grouped: dict[str, list[dict[str, str]]] = defaultdict(list)
-    for row in rows:
-        grouped[row["object"]].append(row)
-
+def object_summary_rows(inventory: Inventory) -> list[list[str]]:
     summary = []
     for object_name in OBJECT_ORDER:
-        object_rows = grouped[object_name]
+        object_rows = inventory.object(object_name)
         if not object_rows:
             continue
         summary.append(
             [
                 object_name,
-                object_rows[0]["canonical_path"],
+                object_rows[0].canonical_path,
                 str(len(object_rows)),
                 OBJECT_NOTES[object_name],
             ]
@@ -189,21 +203,17 @@ def object_summary_rows(rows: list[dict[str, str]]) -> list[list[str]]:
     return summary
 
 
-def readable_lists(rows: list[dict[str, str]]) -> tuple[str, str]:
-    children = [row["member_name"] for row in rows if row["member_type"] == "child"]
-    properties = [row["member_name"] for row in rows if row["member_type"] == "property"]
+def readable_lists(rows: tuple[InventoryRow, ...]) -> tuple[str, str]:
+    children = [row.member_name for row in rows if row.member_type == "child"]
+    properties = [row.member_name for row in rows if row.member_type == "property"]
     child_text = ", ".join(children) if children else "None"
     property_text = ", ".join(properties) if properties else "None"
     return child_text, property_text
 
 
-def object_sections(document: LayoutDocument, rows: list[dict[str, str]]) -> None:
-    grouped: dict[str, list[dict[str, str]]] = defaultdict(list)
-    for row in rows:
-        grouped[row["object"]].append(row)
-
+def object_sections(document: LayoutDocument, inventory: Inventory) -> None:
     for object_name in OBJECT_ORDER:
-        object_rows = grouped[object_name]
+        object_rows = inventory.object(object_name)
         if not object_rows:
             continue
 
@@ -211,8 +221,8 @@ def object_sections(document: LayoutDocument, rows: list[dict[str, str]]) -> Non
         document.section_title(object_name)
         document.bullets(
             [
-                f"Layer: {LAYER_TITLES[object_rows[0]['layer']]}",
-                f"Canonical path: {object_rows[0]['canonical_path']}",
+                f"Layer: {LAYER_TITLES[object_rows[0].layer]}",
+                f"Canonical path: {object_rows[0].canonical_path}",
                 f"Readable entry count: {len(object_rows)}",
                 OBJECT_NOTES[object_name],
             ],
@@ -240,13 +250,18 @@ def source_rows() -> list[list[str]]:
     ]
 
 
-def build_pdf(master_csv: Path, output_pdf: Path) -> int:
-    rows = load_csv(master_csv)
+def layout_reference(
+    inventory: Inventory,
+    *,
+    generated_on: str | None = None,
+    measure_only: bool = False,
+) -> LayoutDocument:
     document = LayoutDocument(
         "Session View UI Terms",
         "Community developer reference",
+        measure_only=measure_only,
     )
-    title_page(document, len(rows))
+    title_page(document, len(inventory), generated_on or generated_on_label())
 
     document.section_title("Quick Orientation")
     document.paragraph(
@@ -270,7 +285,7 @@ def build_pdf(master_csv: Path, output_pdf: Path) -> int:
     )
     document.table(
         ["Layer", "Verified entries"],
-        coverage_rows(rows),
+        coverage_rows(inventory),
         [220.0, CONTENT_WIDTH - 220.0],
         body_size=9.1,
         body_leading=11.6,
@@ -283,14 +298,14 @@ def build_pdf(master_csv: Path, output_pdf: Path) -> int:
     )
     document.table(
         ["Object", "Canonical path", "Entries", "Developer use"],
-        object_summary_rows(rows),
+        object_summary_rows(inventory),
         [86.0, 172.0, 44.0, CONTENT_WIDTH - 86.0 - 172.0 - 44.0],
         body_size=8.1,
         body_leading=10.2,
         header_size=8.5,
     )
 
-    object_sections(document, rows)
+    object_sections(document, inventory)
 
     document.section_title("Recommended Minimum Read Set")
     document.bullets(
@@ -314,20 +329,156 @@ def build_pdf(master_csv: Path, output_pdf: Path) -> int:
         body_leading=9.6,
         header_size=8.6,
     )
+    return document
+
+
+def build_pdf(
+    master_csv: Path,
+    output_pdf: Path,
+    *,
+    generated_on: str | None = None,
+    compress_level: int = DEFAULT_COMPRESS_LEVEL,
+    object_streams: bool = False,
+    linearize: bool = True,
+) -> int:
+    with profiled_stage("load_csv"):
+        inventory = Inventory(load_inventory(master_csv))
+    return write_reference(
+        inventory,
+        output_pdf,
+        generated_on=generated_on,
+        compress_level=compress_level,
+        object_streams=object_streams,
+        linearize=linearize,
+    )
+
 
-    document.add_header_footer()
-    writer = PDFWriter(document.pages)
-    writer.write(output_pdf)
+def write_reference(
+    inventory: Inventory,
+    output_pdf: Path,
+    *,
+    generated_on: str | None = None,
+    compress_level: int = DEFAULT_COMPRESS_LEVEL,
+    object_streams: bool = False,
+    linearize: bool = True,
+) -> int:
+    with profiled_stage("layout"):
+        document = layout_reference(inventory, generated_on=generated_on)
+    with profiled_stage("add_header_footer"):
+        document.add_header_footer()
+    with profiled_stage("pdf_write"):
+        writer = PDFWriter(
+            document.pages,
+            forms=document.forms,
+            compress_level=compress_level,
+            object_streams=object_streams,
+            linearize=linearize and not object_streams,
+        )
+        writer.write(output_pdf)
     return len(document.pages)
 
 
-def main() -> None:
-    repo_root = Path(__file__).resolve().parents[1]
-    master_csv = repo_root / "SESSION_VIEW_READABLE_UI_MASTER_LIST.csv"
-    output_pdf = repo_root / "community-reference" / "SESSION_VIEW_UI_DEVELOPER_REFERENCE.pdf"
+def reference_manifest(
+    master_csv: Path = MASTER_CSV,
+    manifest_path: Path = REFERENCE_MANIFEST,
+    *,
+    compress_level: int,
+    generated_on: str,
+    object_streams: bool = False,
+    linearize: bool = True,
+) -> BuildManifest:
+    return BuildManifest(
+        manifest_path,
+        build_fingerprint(
+            [master_csv, REFERENCE_SOURCE, REPORT_SOURCE],
+            {
+                "compress_level": compress_level,
+                "generated_on": generated_on,
+                "object_streams": object_streams,
+                "linearize": linearize and not object_streams,
+            },
+        ),
+    )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the Session View UI developer reference PDF.")
+    parser.add_argument(
+        "--compress-level",
+        type=compress_level_arg,
+        default=DEFAULT_COMPRESS_LEVEL,
+        help=(
+            "zlib level for PDF content streams; 0 writes them uncompressed, though not byte-identical to the layout "
+            f"of builds from before compression was added (default: {DEFAULT_COMPRESS_LEVEL})"
+        ),
+    )
+    parser.add_argument(
+        "--object-streams",
+        action="store_true",
+        help="write PDF 1.5 with compressed object streams and an xref stream instead of a classic xref table",
+    )
+    parser.add_argument(
+        "--no-linearize",
+        action="store_true",
+        help="write the plain object order instead of a linearized (fast web view) PDF; implied by --object-streams",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="run pagination only and print page and section positions without writing the PDF",
+    )
+    parser.add_argument(
+        "--date",
+        type=date_arg,
+        help="fixed YYYY-MM-DD for the generated-on label (default: SOURCE_DATE_EPOCH, then today)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild even when the build manifest says the PDF is current",
+    )
+    add_profile_args(parser)
+    return parser.parse_args()
+
 
-    page_count = build_pdf(master_csv, output_pdf)
-    print(f"[OK] wrote {output_pdf}")
+def main() -> None:
+    args = parse_args()
+
+    if args.dry_run:
+        print_measurement(layout_reference(Inventory(load_inventory(MASTER_CSV)), measure_only=True).measurement())
+        return
+
+    args.profile = args.profile or args.pstats or args.trace_memory
+    profile = BuildProfile(REFERENCE_PDF.stem, trace_memory=args.trace_memory) if args.profile else None
+    with profiling(profile, REFERENCE_PROFILE.with_suffix(".pstats") if args.pstats else None):
+        run_build(args)
+    if profile is not None:
+        profile.write(REFERENCE_PROFILE)
+        print_profile(profile, REFERENCE_PROFILE)
+
+
+def run_build(args: argparse.Namespace) -> None:
+    generated_on = generated_on_label(args.date)
+    manifest = reference_manifest(
+        compress_level=args.compress_level,
+        generated_on=generated_on,
+        object_streams=args.object_streams,
+        linearize=not args.no_linearize,
+    )
+    if not args.force and not args.profile and manifest.is_current():
+        print(f"[OK] up to date: {REFERENCE_PDF}")
+        return
+
+    page_count = build_pdf(
+        MASTER_CSV,
+        REFERENCE_PDF,
+        generated_on=generated_on,
+        compress_level=args.compress_level,
+        object_streams=args.object_streams,
+        linearize=not args.no_linearize,
+    )
+    manifest.record([REFERENCE_PDF])
+    print(f"[OK] wrote {REFERENCE_PDF}")
     print(f"[OK] pages: {page_count}")
 
 
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import re
+import runpy
+import sys
+import tempfile
+from pathlib import Path
+from typing import Callable
+
+from build_accessibility_workflow_report import (
+    CONTENT_WIDTH,
+    REPO_ROOT,
+    REPORT_SOURCE,
+    Inventory,
+    LayoutDocument,
+    PDFPageSplitter,
+    PDFWriter,
+    ReportPaths,
+    current_inventory_rows,
+    enrich_master_rows,
+    enriched_sort_key,
+    external_sort,
+    iter_enriched,
+    layout_report,
+    load_beta_terms,
+    load_inventory,
+    report_section_cache,
+)
+
+
+MASTER_CSV = REPO_ROOT / "SESSION_VIEW_READABLE_UI_MASTER_LIST.csv"
+
+
+def expect(condition: bool, message: str) -> None:
+    if not condition:
+        raise RuntimeError(message)
+
+
+def check_external_sort(work_dir: Path) -> None:
+    rows = list(iter_enriched(load_inventory(MASTER_CSV)))
+    # A marked copy of every row gives equal keys across run boundaries, so the merge has to stay stable.
+    rows = rows + [row._replace(blind_vi_purpose=f"{row.blind_vi_purpose} (copy)") for row in reversed(rows)]
+    expected = sorted(rows, key=enriched_sort_key)
+    for chunk_rows in (1, 2, 7, 100, len(rows) - 1, len(rows), len(rows) + 1):
+        spill_dir = work_dir / f"sort-{chunk_rows}"
+        spill_dir.mkdir()
+        merged = list(external_sort(rows, enriched_sort_key, spill_dir, chunk_rows=chunk_rows))
+        expect(merged == expected, f"external sort with {chunk_rows}-row chunks differs from sorted()")
+
+
+def sample_document() -> LayoutDocument:
+    rows = [[row.object, row.canonical_path, row.member_name] for row in load_inventory(MASTER_CSV)]
+    document = LayoutDocument("Self-check", "Split round-trip")
+    document.table(["Object", "Canonical path", "Member"], rows, [90.0, CONTENT_WIDTH - 210.0, 120.0])
+    document.add_header_footer()
+    return document
+
+
+def check_split_round_trip(document: LayoutDocument, source: Path, work_dir: Path) -> None:
+    splitter = PDFPageSplitter(source)
+    expect(len(splitter.page_ids) == len(document.pages), f"{source.name} lists the wrong number of pages")
+    for index, page in enumerate(document.pages):
+        expect(splitter.page_content(index) == page.content(), f"{source.name} page {index + 1} content changed")
+
+    serial = splitter.split(work_dir / f"{source.stem}-serial")
+    parallel = splitter.split(work_dir / f"{source.stem}-parallel", jobs=2)
+    expect([path.name for path in serial] == [path.name for path in parallel], "parallel split is out of page order")
+    for index, path in enumerate(serial):
+        preview = PDFPageSplitter(path)
+        expect(len(preview.page_ids) == 1, f"{path.name} of {source.name} is not a single page")
+        expect(preview.object_streams == splitter.object_streams, f"{path.name} of {source.name} changed xref mode")
+        expect(preview.page_content(0) == document.pages[index].content(), f"{path.name} of {source.name} lost content")
+        expect(path.read_bytes() == parallel[index].read_bytes(), f"{path.name} differs between serial and parallel")
+
+
+def check_split_classic(work_dir: Path) -> None:
+    document = sample_document()
+    source = work_dir / "classic.pdf"
+    PDFWriter(document.pages, forms=document.forms).write(source)
+    check_split_round_trip(document, source, work_dir)
+
+
+def check_split_object_streams(work_dir: Path) -> None:
+    document = sample_document()
+    source = work_dir / "object-streams.pdf"
+    PDFWriter(document.pages, forms=document.forms, object_streams=True).write(source)
+    expect(source.read_bytes().startswith(b"%PDF-1.5"), "object-stream output is not PDF 1.5")
+    check_split_round_trip(document, source, work_dir)
+
+
+def check_split_committed_report(work_dir: Path) -> None:
+    # The checked-in report predates the current writer and puts endstream straight after the stream data.
+    source = ReportPaths.for_root().output_pdf
+    splitter = PDFPageSplitter(source)
+    previews = splitter.split(work_dir / "committed")
+    expect(len(previews) == len(splitter.page_ids), f"{source.name} split into the wrong number of previews")
+    for index, path in enumerate(previews):
+        preview = PDFPageSplitter(path)
+        expect(len(preview.page_ids) == 1, f"{path.name} of {source.name} is not a single page")
+        expect(preview.page_content(0) == splitter.page_content(index), f"{path.name} of {source.name} lost content")
+
+
+def linearization_params(data: bytes) -> dict[str, int]:
+    header = re.match(rb"%PDF-1\.\d\n%[^\n]*\n(\d+) 0 obj\n(<<.*?>>)", data, re.S)
+    expect(header is not None and b"/Linearized 1" in header.group(2), "output does not start with a linearization dict")
+    params = {"object": int(header.group(1))}
+    for key in ("L", "O", "E", "N", "T"):
+        match = re.search(rb"/" + key.encode() + rb" (\d+)", header.group(2))
+        expect(match is not None, f"linearization dict has no /{key}")
+        params[key] = int(match.group(1))
+    hint = re.search(rb"/H \[(\d+) (\d+)\]", header.group(2))
+    expect(hint is not None, "linearization dict has no /H")
+    params["hint_offset"], params["hint_length"] = int(hint.group(1)), int(hint.group(2))
+    return params
+
+
+def check_linearized_layout(document: LayoutDocument, source: Path) -> None:
+    data = source.read_bytes()
+    params = linearization_params(data)
+    splitter = PDFPageSplitter(source)
+    expect(params["L"] == len(data), f"/L {params['L']} is not the file length {len(data)}")
+    expect(params["N"] == len(document.pages), f"/N {params['N']} is not the page count {len(document.pages)}")
+    expect(params["O"] == splitter.page_ids[0], f"/O {params['O']} is not the first page object")
+    first_page_objects = [splitter.page_ids[0], *splitter.page_resources(splitter.page_ids[0])]
+    expect(
+        all(splitter.offsets[object_id] < params["E"] for object_id in first_page_objects),
+        "an object page 1 needs lies past /E",
+    )
+    if len(document.pages) > 1:
+        expect(params["E"] == splitter.offsets[splitter.page_ids[1]], "/E does not end where page 2 starts")
+    main_xref = data.rfind(b"xref", 0, params["T"])
+    expect(
+        data[params["T"] : params["T"] + 20] == b"\n0000000000 65535 f ",
+        "/T does not point just before the first main xref entry",
+    )
+    expect(re.search(rb"/Prev " + str(main_xref).encode() + rb" ", data[: params["E"]]) is not None, "/Prev misses the main xref")
+    hint = data[params["hint_offset"] : params["hint_offset"] + params["hint_length"]]
+    expect(re.match(rb"\d+ 0 obj\n<<[^>]*/S \d+", hint) is not None, "/H does not point at the hint stream")
+    expect(hint.endswith(b"endstream\nendobj\n"), "/H length does not cover the whole hint stream object")
+
+
+def check_linearized(work_dir: Path) -> None:
+    document = sample_document()
+    single = LayoutDocument("Self-check", "Single page")
+    single.add_header_footer()
+    for name, sample in (("linearized", document), ("linearized-single", single)):
+        source = work_dir / f"{name}.pdf"
+        PDFWriter(sample.pages, forms=sample.forms, linearize=True).write(source)
+        check_linearized_layout(sample, source)
+        check_split_round_trip(sample, source, work_dir)
+
+
+def check_section_cache_entry_points(work_dir: Path) -> None:
+    paths = ReportPaths.for_root()
+    cache_path = work_dir / "report.sections"
+    # A standalone build runs the report script as __main__, not as the importable module build_docs.py uses.
+    standalone = runpy.run_path(str(REPORT_SOURCE), run_name="__standalone_report__")
+    written = standalone["report_section_cache"](cache_path)
+    standalone["layout_report"](
+        standalone["Inventory"](standalone["enrich_master_rows"](standalone["load_inventory"](paths.master_csv))),
+        standalone["current_inventory_rows"](standalone["load_beta_terms"](paths.current_csv)),
+        generated_on="2000-01-01",
+        section_cache=written,
+    )
+    written.save()
+    expect(written.misses > 0, "the standalone layout stored no sections")
+
+    loaded = report_section_cache(cache_path)
+    expect(len(loaded.entries) == written.misses, f"an importer loaded {len(loaded.entries)} of {written.misses} sections")
+    inventory = Inventory(enrich_master_rows(load_inventory(paths.master_csv)))
+    current_rows = current_inventory_rows(load_beta_terms(paths.current_csv))
+    replayed = layout_report(inventory, current_rows, generated_on="2000-01-01", section_cache=loaded)
+    fresh = layout_report(inventory, current_rows, generated_on="2000-01-01")
+    expect(loaded.misses == 0, f"{loaded.misses} sections were laid out again instead of reused")
+    expect(
+        [page.content() for page in replayed.pages] == [page.content() for page in fresh.pages],
+        "replayed sections differ from a fresh layout",
+    )
+
+
+CHECKS: dict[str, Callable[[Path], None]] = {
+    "external_sort": check_external_sort,
+    "section_cache_entry_points": check_section_cache_entry_points,
+    "split_classic": check_split_classic,
+    "split_object_streams": check_split_object_streams,
+    "split_committed_report": check_split_committed_report,
+    "linearized": check_linearized,
+}
+
+
+def check_arg(value: str) -> str:
+    if value not in CHECKS:
+        raise argparse.ArgumentTypeError(f"unknown check {value!r}, expected one of {', '.join(CHECKS)}")
+    return value
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Self-check the streaming sort, PDF writer modes and preview splitter against known-good behaviour."
+    )
+    parser.add_argument(
+        "checks",
+        nargs="*",
+        type=check_arg,
+        help=f"checks to run (default: all of {', '.join(CHECKS)})",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    failed = 0
+    for name in args.checks or CHECKS:
+        with tempfile.TemporaryDirectory(prefix="docs-check-") as work_dir:
+            try:
+                CHECKS[name](Path(work_dir))
+            except Exception as error:
+                failed += 1
+                print(f"[FAIL] {name}: {type(error).__name__}: {error}")
+                continue
+        print(f"[OK] {name}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from build_accessibility_workflow_report import (
+    ENRICHED_FIELDNAMES,
+    REPO_ROOT,
+    WORKFLOWS,
+    InventoryRow,
+    enrich_master_rows,
+    load_inventory,
+    write_csv,
+)
+
+
+TRACK_TOKEN = "tracks N"
+SLOT_TOKEN = "clip_slots M"
+SCENE_TOKEN = "scenes N"
+DEFAULT_TRACKS = 128
+DEFAULT_SCENES = 512
+OUTPUT_FORMATS = ("csv", "jsonl")
+
+
+def instance_scope(canonical_path: str) -> str:
+    if SLOT_TOKEN in canonical_path:
+        return "cell"
+    if TRACK_TOKEN in canonical_path:
+        return "track"
+    if SCENE_TOKEN in canonical_path:
+        return "scene"
+    return "set"
+
+
+def scope_instances(scope: str, tracks: int, scenes: int) -> Iterator[tuple[str, tuple[tuple[str, str], ...]]]:
+    if scope == "cell":
+        for track in range(tracks):
+            for scene in range(scenes):
+                yield (
+                    f"Track {track + 1}, scene {scene + 1}",
+                    ((TRACK_TOKEN, f"tracks {track}"), (SLOT_TOKEN, f"clip_slots {scene}")),
+                )
+    elif scope == "track":
+        for track in range(tracks):
+            yield f"Track {track + 1}", ((TRACK_TOKEN, f"tracks {track}"),)
+    elif scope == "scene":
+        for scene in range(scenes):
+            yield f"Scene {scene + 1}", ((SCENE_TOKEN, f"scenes {scene}"),)
+
+
+def expand_row(row: InventoryRow, tracks: int, scenes: int) -> Iterator[InventoryRow]:
+    scope = instance_scope(row.canonical_path)
+    if scope == "set":
+        yield row
+        return
+    for prefix, replacements in scope_instances(scope, tracks, scenes):
+        path = row.canonical_path
+        context = row.context_label
+        for token, value in replacements:
+            path = path.replace(token, value)
+            context = context.replace(token, value)
+        yield row._replace(
+            canonical_path=path,
+            accessible_label=f"{prefix}: {row.accessible_label}",
+            context_label=context,
+        )
+
+
+def expand_inventory(templates: Iterable[InventoryRow], tracks: int, scenes: int) -> Iterator[InventoryRow]:
+    for row in enrich_master_rows(templates):
+        yield from expand_row(row, tracks, scenes)
+
+
+def expanded_row_count(templates: Iterable[InventoryRow], tracks: int, scenes: int) -> Counter[str]:
+    per_instance = {"cell": tracks * scenes, "track": tracks, "scene": scenes, "set": 1}
+    counts: Counter[str] = Counter()
+    for row in templates:
+        scope = instance_scope(row.canonical_path)
+        counts[scope] += per_instance[scope]
+    return counts
+
+
+def write_jsonl(path: Path, rows: Iterable[InventoryRow], fieldnames: list[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as handle:
+        for row in rows:
+            handle.write(json.dumps({name: getattr(row, name) for name in fieldnames}, ensure_ascii=False))
+            handle.write("\n")
+
+
+def count_arg(value: str) -> int:
+    count = int(value)
+    if count < 1:
+        raise argparse.ArgumentTypeError("set dimensions must be at least 1")
+    return count
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Expand the template inventory into per-track, per-scene and per-slot accessibility strings."
+    )
+    parser.add_argument(
+        "--tracks",
+        type=count_arg,
+        default=DEFAULT_TRACKS,
+        help=f"tracks in the expanded set (default: {DEFAULT_TRACKS})",
+    )
+    parser.add_argument(
+        "--scenes",
+        type=count_arg,
+        default=DEFAULT_SCENES,
+        help=f"scenes, and so clip slots per track, in the expanded set (default: {DEFAULT_SCENES})",
+    )
+    parser.add_argument(
+        "--master-csv",
+        type=Path,
+        default=REPO_ROOT / "SESSION_VIEW_READABLE_UI_MASTER_LIST.csv",
+        help="template inventory to expand (default: SESSION_VIEW_READABLE_UI_MASTER_LIST.csv at the repo root)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="output path (default: tmp/expanded-inventory/session_view_instances_<tracks>x<scenes>.<format>)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        help="output format (default: taken from the --output suffix, otherwise csv)",
+    )
+    parser.add_argument(
+        "--count-only",
+        action="store_true",
+        help="print the expanded row counts per scope without writing any rows",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    templates = load_inventory(args.master_csv)
+    counts = expanded_row_count(templates, args.tracks, args.scenes)
+    print(f"Set shape: {args.tracks} tracks x {args.scenes} scenes")
+    for scope in ("set", "track", "scene", "cell"):
+        print(f"{scope}: {counts[scope]} rows")
+    print(f"Total: {sum(counts.values())} rows")
+    if args.count_only:
+        return
+
+    output_format = args.format
+    if output_format is None:
+        output_format = "jsonl" if args.output is not None and args.output.suffix == ".jsonl" else "csv"
+    output = args.output or (
+        REPO_ROOT / "tmp" / "expanded-inventory" / f"session_view_instances_{args.tracks}x{args.scenes}.{output_format}"
+    )
+
+    workflow_counts: Counter[str] = Counter()
+
+    def counted(rows: Iterable[InventoryRow]) -> Iterator[InventoryRow]:
+        for row in rows:
+            workflow_counts[row.workflow_title] += 1
+            yield row
+
+    rows = counted(expand_inventory(templates, args.tracks, args.scenes))
+    if output_format == "jsonl":
+        write_jsonl(output, rows, ENRICHED_FIELDNAMES)
+    else:
+        write_csv(output, rows, ENRICHED_FIELDNAMES)
+    print(f"Expanded inventory: {output}")
+    for workflow in WORKFLOWS:
+        print(f"{workflow.title}: {workflow_counts[workflow.title]} items")
+
+
+if __name__ == "__main__":
+    main()